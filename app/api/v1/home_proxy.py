@@ -14,7 +14,7 @@ from fastapi import (
 )
 from typing import Optional, Dict
 import logging
-import json
+import orjson
 
 from app.schemas.common import APIResponse
 from app.proxy_pool.models import (
@@ -193,7 +193,7 @@ async def send_command(
 
         # 发送指令
         websocket = active_connections[agent_id]
-        await websocket.send_json(command.model_dump())
+        await websocket.send_bytes(orjson.dumps(command.model_dump()))
 
         return APIResponse(
             code=0,
@@ -297,7 +297,7 @@ async def websocket_endpoint(
     try:
         # 等待第一条消息（应该是心跳或注册消息）
         data = await websocket.receive_text()
-        message = json.loads(data)
+        message = orjson.loads(data)
 
         # 验证 Agent
         if message.get("action") == "heartbeat":
@@ -317,15 +317,11 @@ async def websocket_endpoint(
             await service.update_heartbeat(heartbeat)
 
             # 发送确认消息
-            await websocket.send_json(
-                {"action": "connected", "message": "Connected successfully"}
+            await websocket.send_bytes(
+                orjson.dumps({"action": "connected", "message": "Connected successfully"})
             )
 
-            # 持续接收消息
-            while True:
-                data = await websocket.receive_text()
-                message = json.loads(data)
-
+            async def handle_message(message: dict):
                 action = message.get("action")
 
                 if action == "heartbeat":
@@ -341,6 +337,18 @@ async def websocket_endpoint(
                 else:
                     logger.warning(f"Unknown action from {agent_id}: {action}")
 
+            # 持续接收消息
+            while True:
+                data = await websocket.receive_text()
+                message = orjson.loads(data)
+
+                if message.get("action") == "batch":
+                    # Agent 合并发送的多条消息，按顺序逐条处理
+                    for item in message.get("items", []):
+                        await handle_message(item)
+                else:
+                    await handle_message(message)
+
         else:
             await websocket.close(code=1008, reason="Expected heartbeat message")
 
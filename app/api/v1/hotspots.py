@@ -11,6 +11,8 @@ from app.schemas.hotspot import (
     # 请求/响应模型
     AddHotspotKeywordRequest,
     AddHotspotKeywordResponse,
+    AddHotspotKeywordsBatchRequest,
+    AddHotspotKeywordsBatchResponse,
     CheckHotspotRequest,
     CheckHotspotResponse,
     ListHotspotsResponse,
@@ -73,6 +75,37 @@ async def add_keyword_from_analysis(request: AddHotspotKeywordRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/add-keywords/batch", response_model=AddHotspotKeywordsBatchResponse)
+async def add_keywords_from_analysis_batch(request: AddHotspotKeywordsBatchRequest):
+    """
+    批量新增词的接口 - 与 /add-keyword 规则一致，一次请求处理多个热词
+
+    用于一次爬取产生大量热词时，减少连接占用和数据库往返次数
+    """
+    try:
+        results = await hotspot_service.add_keywords_from_analysis_batch(
+            [(item.analysis, item.platform_data) for item in request.items]
+        )
+        return AddHotspotKeywordsBatchResponse(
+            success=True,
+            items=[
+                AddHotspotKeywordResponse(
+                    success=True,
+                    hotspot_id=result["hotspot_id"],
+                    message=result["message"],
+                    action=result["action"],
+                )
+                for result in results
+            ],
+        )
+    except Exception as e:
+        logger.error(
+            f"批量添加关键词时发生错误 - count: {len(request.items)}, "
+            f"error: {str(e)}, traceback: {traceback.format_exc()}"
+        )
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/check-exists", response_model=CheckHotspotResponse)
 async def check_hotspot_exists(request: CheckHotspotRequest):
     """
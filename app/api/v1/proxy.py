@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query
+from dataclasses import asdict
 from typing import Optional
 import time
 import httpx
@@ -110,8 +111,8 @@ async def get_proxy_ips(
         end_index = start_index + page_size
         paginated_ips = ip_list[start_index:end_index]
 
-        # 构建响应
-        items = [ProxyIpInfo(**ip) for ip in paginated_ips]
+        # 构建响应（只转换当前页）
+        items = [ProxyIpInfo(**asdict(ip)) for ip in paginated_ips]
 
         return APIResponse(
             code=0,
@@ -216,7 +217,7 @@ async def get_proxy_stats():
 
         # 统计信息
         total_ips = len(ip_list)
-        valid_ips = sum(1 for ip in ip_list if ip.get("is_valid", False))
+        valid_ips = sum(1 for ip in ip_list if ip.is_valid)
         expired_ips = total_ips - valid_ips
 
         return APIResponse(
@@ -8,6 +8,8 @@ from app.schemas.push import (
     GetPendingPushResponse,
     UpdatePushStatusRequest,
     UpdatePushStatusResponse,
+    BatchUpdatePushStatusRequest,
+    BatchUpdatePushStatusResponse,
 )
 
 # 配置日志
@@ -130,3 +132,38 @@ async def update_push_status(push_id: int, request: UpdatePushStatusRequest):
             f"new_status: {request.status}, error: {str(e)}, traceback: {traceback.format_exc()}"
         )
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.patch("/queue/status/batch", response_model=BatchUpdatePushStatusResponse)
+async def update_push_statuses(request: BatchUpdatePushStatusRequest):
+    """
+    批量更新推送状态
+
+    一次请求上报多个推送结果
+
+    参数：
+    - items: 待更新项列表，每项包含 push_id 和 status（pending, sent, failed）
+
+    返回：
+    - success: 是否成功
+    - updated_count: 更新的项数
+    - not_found_ids: 不存在的推送队列项ID
+
+    异常：
+    - 500: 服务器错误
+    """
+    try:
+        result = await push_service.update_push_statuses(
+            [(item.push_id, item.status) for item in request.items]
+        )
+        return BatchUpdatePushStatusResponse(
+            success=result["success"],
+            updated_count=result["updated_count"],
+            not_found_ids=result["not_found_ids"],
+        )
+    except Exception as e:
+        logger.error(
+            f"批量更新推送状态时发生错误 - count: {len(request.items)}, "
+            f"error: {str(e)}, traceback: {traceback.format_exc()}"
+        )
+        raise HTTPException(status_code=500, detail=str(e))
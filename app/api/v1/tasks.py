@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Optional
 from celery.result import AsyncResult
 from datetime import datetime
-import json
+import orjson
 
 from app.schemas.task import (
     TaskCreateRequest,
@@ -185,7 +185,7 @@ async def get_task_status(task_id: str, conn=Depends(get_db)):
                 total=db_task.progress_total,
                 percentage=db_task.progress_percentage,
             ),
-            result=json.loads(db_task.result) if db_task.result else None,
+            result=orjson.loads(db_task.result) if db_task.result else None,
             error=db_task.error,
             started_at=db_task.started_at.isoformat() if db_task.started_at else None,
             finished_at=db_task.finished_at.isoformat()
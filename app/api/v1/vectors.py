@@ -1,8 +1,13 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
+import logging
+import orjson
 from app.services.vector_service import vector_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -23,6 +28,20 @@ class AddVectorResponse(BaseModel):
     message: str
 
 
+class AddVectorsBatchRequest(BaseModel):
+    """批量添加向量请求"""
+
+    items: List[AddVectorRequest] = Field(..., min_length=1, description="向量列表")
+
+
+class AddVectorsBatchResponse(BaseModel):
+    """批量添加向量响应"""
+
+    success: bool
+    count: int
+    message: str
+
+
 class SearchVectorRequest(BaseModel):
     """向量搜索请求"""
 
@@ -32,6 +51,7 @@ class SearchVectorRequest(BaseModel):
     threshold: Optional[float] = Field(
         None, ge=0.0, le=1.0, description="相似度阈值（0-1）"
     )
+    include_content: bool = Field(True, description="是否返回向量的文本内容")
 
 
 class VectorSearchResult(BaseModel):
@@ -74,7 +94,8 @@ class CollectionInfo(BaseModel):
 
     collection_id: str
     count: int
-    vectors: List[VectorInfo]
+    latest: Optional[str] = None
+    vectors: Optional[List[VectorInfo]] = None
 
 
 class ListCollectionsResponse(BaseModel):
@@ -84,6 +105,16 @@ class ListCollectionsResponse(BaseModel):
     collections: List[CollectionInfo]
 
 
+class ListVectorsResponse(BaseModel):
+    """集合向量分页列表响应"""
+
+    success: bool
+    total: int
+    page: int
+    page_size: int
+    vectors: List[VectorInfo]
+
+
 # ==================== API 端点 ====================
 
 
@@ -109,6 +140,26 @@ async def add_vector(request: AddVectorRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/add/batch", response_model=AddVectorsBatchResponse)
+async def add_vectors_batch(request: AddVectorsBatchRequest):
+    """
+    批量添加向量
+
+    一次请求生成所有文本的向量并批量写入数据库
+    """
+    try:
+        count = await vector_service.add_vectors_bulk(
+            [item.model_dump() for item in request.items]
+        )
+        return AddVectorsBatchResponse(
+            success=True,
+            count=count,
+            message=f"{count} vectors added successfully",
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/search", response_model=SearchVectorResponse)
 async def search_vectors(request: SearchVectorRequest):
     """
@@ -122,6 +173,7 @@ async def search_vectors(request: SearchVectorRequest):
             collection_id=request.collection_id,
             top_k=request.top_k,
             threshold=request.threshold,
+            include_content=request.include_content,
         )
         return SearchVectorResponse(
             success=True, results=results, count=len(results)
@@ -181,13 +233,81 @@ async def get_vector(vector_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _stream_collections(
+    collections: AsyncIterator[Dict[str, Any]], first: Optional[Dict[str, Any]]
+) -> AsyncIterator[bytes]:
+    """
+    按集合逐块输出 ListCollectionsResponse 格式的 JSON
+
+    Args:
+        collections: iter_collections() 生成器（第一个集合已取出）
+        first: 第一个集合，没有集合时为 None
+    """
+    try:
+        yield b'{"success":true,"collections":['
+        if first is not None:
+            yield orjson.dumps(first)
+            async for collection in collections:
+                yield b"," + orjson.dumps(collection)
+        yield b"]}"
+    except Exception:
+        # 响应头已发出，无法再返回 500；记录错误并中断连接，避免客户端收到截断但看似完整的 JSON
+        logger.exception("Failed to stream vector collections")
+        raise
+    finally:
+        # 客户端提前断开时也要释放游标占用的数据库连接
+        await collections.aclose()
+
+
 @router.get("/collections", response_model=ListCollectionsResponse)
-async def list_collections():
+async def list_collections(
+    include_vectors: bool = Query(
+        False, description="是否返回每个集合的全部向量（流式输出，数据量大时慎用）"
+    ),
+):
     """
     列出所有集合及其向量数量
+
+    默认只返回每个集合的向量数量和最近写入时间，向量数据请通过
+    /collection/{collection_id}/vectors 分页获取；include_vectors=true 时
+    以流式 JSON 返回全部向量
     """
+    if include_vectors:
+        # 先取出第一个集合再开始响应，连接或查询失败时仍能返回 500
+        collections = vector_service.iter_collections()
+        try:
+            first = await anext(collections, None)
+        except Exception as e:
+            await collections.aclose()
+            raise HTTPException(status_code=500, detail=str(e))
+        return StreamingResponse(
+            _stream_collections(collections, first), media_type="application/json"
+        )
+
     try:
         collections = await vector_service.list_collections()
         return ListCollectionsResponse(success=True, collections=collections)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/collection/{collection_id}/vectors", response_model=ListVectorsResponse)
+async def list_vectors(
+    collection_id: str,
+    page: int = Query(1, ge=1, description="页码，从1开始"),
+    page_size: int = Query(20, ge=1, le=100, description="每页数量，最大100"),
+):
+    """
+    分页列出指定集合的向量
+    """
+    try:
+        vectors, total = await vector_service.list_vectors(collection_id, page, page_size)
+        return ListVectorsResponse(
+            success=True,
+            total=total,
+            page=page,
+            page_size=page_size,
+            vectors=vectors,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
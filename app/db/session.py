@@ -16,8 +16,9 @@ import asyncpg
 import pymysql
 import psycopg2
 import psycopg2.extras
+import orjson
 import os
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 from contextlib import contextmanager
 from app.config import settings
 from pgvector.asyncpg import register_vector
@@ -171,6 +172,48 @@ async def get_db() -> AsyncGenerator:
 # ==================== 异步 PostgreSQL 连接池管理 ====================
 
 
+def _encode_json(value: Any) -> bytes:
+    """json 参数编码：已序列化的字符串原样传递，其余对象用 orjson 序列化"""
+    if isinstance(value, str):
+        return value.encode()
+    return orjson.dumps(value)
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    """jsonb 二进制格式 = 版本号 1 + JSON 文本"""
+    return b"\x01" + _encode_json(value)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    """跳过 jsonb 二进制格式的版本号字节"""
+    return orjson.loads(data[1:])
+
+
+async def _init_pg_connection(conn: asyncpg.Connection):
+    """
+    初始化 PostgreSQL 连接
+
+    - 注册 pgvector 类型
+    - 注册 json/jsonb 编解码器（orjson），查询结果直接返回 Python 对象，
+      无需在业务代码中逐行 json.loads；使用二进制格式，以便 COPY 批量写入
+    """
+    await register_vector(conn)
+    await conn.set_type_codec(
+        "json",
+        schema="pg_catalog",
+        encoder=_encode_json,
+        decoder=orjson.loads,
+        format="binary",
+    )
+    await conn.set_type_codec(
+        "jsonb",
+        schema="pg_catalog",
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        format="binary",
+    )
+
+
 async def init_vector_db():
     """初始化 PgVector 数据库连接池"""
     global pg_pool
@@ -182,7 +225,9 @@ async def init_vector_db():
         database=settings.PGVECTOR_DB,
         min_size=1,
         max_size=10,
-        init=register_vector,
+        # 每个连接缓存的预编译语句数量（语句文本相同即可复用解析与执行计划）
+        statement_cache_size=1024,
+        init=_init_pg_connection,
     )
     print(
         f"PgVector connection pool initialized: {settings.PGVECTOR_HOST}:{settings.PGVECTOR_PORT}/{settings.PGVECTOR_DB}"
@@ -8,6 +8,7 @@ import asyncio
 import logging
 from app.config import settings
 from app.db.session import init_db, close_db, init_vector_db, close_vector_db
+from app.utils.config_manager import ProxyConfigManager
 from app.middleware.request_logging import log_request_body_middleware
 from app.background.timeout_checker import (
     check_timeout_tasks_background,
@@ -93,6 +94,7 @@ async def lifespan(app: FastAPI):
 
     await close_db()
     await close_vector_db()
+    await ProxyConfigManager.close_redis_clients()
     print("Trend API Server shut down")
 
 
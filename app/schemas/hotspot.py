@@ -95,6 +95,23 @@ class AddHotspotKeywordResponse(BaseModel):
     action: str = Field(..., description="执行的操作: created/rejected/updated")
 
 
+class AddHotspotKeywordsBatchRequest(BaseModel):
+    """批量新增热词请求"""
+
+    items: List[AddHotspotKeywordRequest] = Field(
+        ..., min_length=1, description="新增热词请求列表"
+    )
+
+
+class AddHotspotKeywordsBatchResponse(BaseModel):
+    """批量新增热词响应"""
+
+    success: bool
+    items: List[AddHotspotKeywordResponse] = Field(
+        default_factory=list, description="与请求顺序一致的处理结果"
+    )
+
+
 class CheckHotspotRequest(BaseModel):
     """检查热词是否存在请求"""
 
@@ -68,3 +68,24 @@ class UpdatePushStatusResponse(BaseModel):
     message: str
     old_status: PushStatus
     new_status: PushStatus
+
+
+class PushStatusUpdateItem(BaseModel):
+    """批量更新推送状态的单项"""
+
+    push_id: int = Field(..., description="推送队列项ID")
+    status: PushStatus = Field(..., description="新的推送状态")
+
+
+class BatchUpdatePushStatusRequest(BaseModel):
+    """批量更新推送状态请求"""
+
+    items: List[PushStatusUpdateItem] = Field(..., min_length=1, description="待更新项列表")
+
+
+class BatchUpdatePushStatusResponse(BaseModel):
+    """批量更新推送状态响应"""
+
+    success: bool
+    updated_count: int
+    not_found_ids: List[int]
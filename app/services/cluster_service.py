@@ -1,7 +1,7 @@
 from typing import List, Optional, Dict, Any
 from app.db import session
 from app.schemas.hotspot import ClusterInfo, PlatformStat
-import json
+import orjson
 from datetime import datetime
 
 
@@ -174,7 +174,7 @@ class ClusterService:
                 # 解析平台统计数据
                 platforms_data = r["platforms"]
                 if isinstance(platforms_data, str):
-                    platforms_data = json.loads(platforms_data)
+                    platforms_data = orjson.loads(platforms_data)
 
                 platform_stats = (
                     [
@@ -190,7 +190,7 @@ class ClusterService:
                         id=r["id"],
                         cluster_name=r["cluster_name"],
                         member_count=r["member_count"],
-                        keywords=json.loads(r["keywords"])
+                        keywords=orjson.loads(r["keywords"])
                         if isinstance(r["keywords"], str)
                         else r["keywords"],
                         selected_hotspot_id=r["selected_hotspot_id"],
@@ -198,7 +198,7 @@ class ClusterService:
                         updated_at=r["updated_at"],
                         statuses=r["statuses"]
                         if isinstance(r["statuses"], list)
-                        else json.loads(r["statuses"]),
+                        else orjson.loads(r["statuses"]),
                         last_hotspot_update=r["last_hotspot_update"],
                         platforms=platform_stats,
                     )
@@ -264,7 +264,7 @@ class ClusterService:
             # 解析平台统计数据
             platforms_data = r["platforms"]
             if isinstance(platforms_data, str):
-                platforms_data = json.loads(platforms_data)
+                platforms_data = orjson.loads(platforms_data)
 
             platform_stats = (
                 [
@@ -279,7 +279,7 @@ class ClusterService:
                 id=r["id"],
                 cluster_name=r["cluster_name"],
                 member_count=r["member_count"],
-                keywords=json.loads(r["keywords"])
+                keywords=orjson.loads(r["keywords"])
                 if isinstance(r["keywords"], str)
                 else r["keywords"],
                 selected_hotspot_id=r["selected_hotspot_id"],
@@ -287,7 +287,7 @@ class ClusterService:
                 updated_at=r["updated_at"],
                 statuses=r["statuses"]
                 if isinstance(r["statuses"], list)
-                else json.loads(r["statuses"]),
+                else orjson.loads(r["statuses"]),
                 last_hotspot_update=r["last_hotspot_update"],
                 platforms=platform_stats,
             )
@@ -333,7 +333,7 @@ class ClusterService:
                     RETURNING id
                     """,
                     cluster_name,
-                    json.dumps(keywords, ensure_ascii=False),
+                    orjson.dumps(keywords).decode(),
                 )
 
                 # 如果提供了热点ID，更新它们的cluster_id
@@ -386,7 +386,7 @@ class ClusterService:
                 all_keywords = []
                 for cluster in clusters:
                     keywords = (
-                        json.loads(cluster["keywords"])
+                        orjson.loads(cluster["keywords"])
                         if isinstance(cluster["keywords"], str)
                         else cluster["keywords"]
                     )
@@ -409,7 +409,7 @@ class ClusterService:
                     WHERE id = $3
                     """,
                     final_cluster_name,
-                    json.dumps(unique_keywords),
+                    orjson.dumps(unique_keywords).decode(),
                     target_cluster_id,
                 )
 
@@ -500,7 +500,7 @@ class ClusterService:
                         RETURNING id
                         """,
                         final_new_cluster_name,
-                        json.dumps(removed_keywords),
+                        orjson.dumps(removed_keywords).decode(),
                     )
 
                     # 更新移出的热点到新簇
@@ -528,7 +528,7 @@ class ClusterService:
 
                 # 更新原簇的关键词列表
                 old_keywords = (
-                    json.loads(cluster["keywords"])
+                    orjson.loads(cluster["keywords"])
                     if isinstance(cluster["keywords"], str)
                     else cluster["keywords"]
                 )
@@ -551,7 +551,7 @@ class ClusterService:
                             updated_at = CURRENT_TIMESTAMP
                         WHERE id = $2
                         """,
-                        json.dumps(remaining_keywords),
+                        orjson.dumps(remaining_keywords).decode(),
                         cluster_id,
                     )
                 else:
@@ -682,7 +682,7 @@ class ClusterService:
                 if cluster:
                     # 更新簇的关键词列表
                     old_keywords = (
-                        json.loads(cluster["keywords"])
+                        orjson.loads(cluster["keywords"])
                         if isinstance(cluster["keywords"], str)
                         else cluster["keywords"]
                     )
@@ -704,7 +704,7 @@ class ClusterService:
                                 updated_at = CURRENT_TIMESTAMP
                             WHERE id = $2
                             """,
-                            json.dumps(new_keywords),
+                            orjson.dumps(new_keywords).decode(),
                             cluster_id,
                         )
                     else:
@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from app.db import session
 from app.services.vector_service import vector_service
@@ -10,7 +10,95 @@ from app.schemas.hotspot import (
     PlatformInfo,
     PlatformDataInput,
 )
-import json
+import orjson
+
+
+def _json_dumps(value: Any) -> str:
+    """使用 orjson 序列化为字符串（用于绑定 jsonb 参数）"""
+    return orjson.dumps(value).decode()
+
+
+# 平台名称映射
+_PLATFORM_NAME_MAP = {
+    "xhs": "小红书",
+    "dy": "抖音",
+    "bili": "哔哩哔哩",
+    "ks": "快手",
+    "wb": "微博",
+    "tieba": "贴吧",
+    "zhihu": "知乎",
+}
+
+# 热度值单位倍数（单位位于字符串末尾，如 "541.2万"）
+_VIEWNUM_UNIT = {"万": 10000, "亿": 100000000}
+
+# 状态值到枚举的映射（比 HotspotStatus(value) 构造更快）
+_STATUS_BY_VALUE = {s.value: s for s in HotspotStatus}
+
+# 根据 AI 分析结果更新已有热点
+_UPDATE_FROM_ANALYSIS_SQL = """
+    UPDATE hotspots
+    SET last_seen_at = CURRENT_TIMESTAMP,
+        appearance_count = appearance_count + 1,
+        updated_at = CURRENT_TIMESTAMP,
+        tags = $2,
+        confidence = $3,
+        opportunities = $4,
+        reasoning_keep = $5,
+        reasoning_risk = $6,
+        primary_category = $7,
+        platform_url = COALESCE($8, platform_url),
+        word_cover = COALESCE($9, word_cover)
+    WHERE id = $1
+"""
+
+# 插入新热点（first_seen_at / last_seen_at 使用数据库默认值 CURRENT_TIMESTAMP）
+_INSERT_HOTSPOT_SQL = """
+    INSERT INTO hotspots (
+        keyword, normalized_keyword, embedding, embedding_model,
+        cluster_id, appearance_count, platforms,
+        status, is_filtered, filter_reason, filtered_at,
+        tags, confidence, opportunities, reasoning_keep, reasoning_risk,
+        platform_url, primary_category, word_cover
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19)
+"""
+
+# 批量插入新热点：参数为 _build_insert_args 各列转置后的数组，一条语句写入并返回 id
+# TEXT[] 列无法作为二维数组 unnest（各行长度不同），以 jsonb 数组传入后再展开
+_INSERT_HOTSPOTS_BATCH_SQL = """
+    INSERT INTO hotspots (
+        keyword, normalized_keyword, embedding, embedding_model,
+        cluster_id, appearance_count, platforms,
+        status, is_filtered, filter_reason, filtered_at,
+        tags, confidence, opportunities, reasoning_keep, reasoning_risk,
+        platform_url, primary_category, word_cover
+    )
+    SELECT
+        t.keyword, t.normalized_keyword, t.embedding, t.embedding_model,
+        t.cluster_id, t.appearance_count, t.platforms,
+        t.status, t.is_filtered, t.filter_reason, t.filtered_at,
+        ARRAY(SELECT jsonb_array_elements_text(t.tags)),
+        t.confidence,
+        ARRAY(SELECT jsonb_array_elements_text(t.opportunities)),
+        ARRAY(SELECT jsonb_array_elements_text(t.reasoning_keep)),
+        ARRAY(SELECT jsonb_array_elements_text(t.reasoning_risk)),
+        t.platform_url, t.primary_category, t.word_cover
+    FROM unnest(
+        $1::text[], $2::text[], $3::vector[], $4::text[],
+        $5::bigint[], $6::int[], $7::jsonb[],
+        $8::text[], $9::boolean[], $10::text[], $11::timestamp[],
+        $12::jsonb[], $13::float8[], $14::jsonb[], $15::jsonb[], $16::jsonb[],
+        $17::text[], $18::text[], $19::jsonb[]
+    ) AS t(
+        keyword, normalized_keyword, embedding, embedding_model,
+        cluster_id, appearance_count, platforms,
+        status, is_filtered, filter_reason, filtered_at,
+        tags, confidence, opportunities, reasoning_keep, reasoning_risk,
+        platform_url, primary_category, word_cover
+    )
+    RETURNING id, keyword
+"""
 
 
 class HotspotService:
@@ -21,10 +109,50 @@ class HotspotService:
     HIGH_SIMILARITY_THRESHOLD = 0.85  # 高相似度阈值
     SIMILAR_THRESHOLD = 0.75  # 相似阈值
 
+    # halfvec 索引召回的候选数量（之后用 float32 向量精确重排）
+    RERANK_CANDIDATES = 20
+
+    # 带 7 天时间窗口的向量查询使用的 hnsw.ef_search
+    # 时间过滤发生在 HNSW 扫描之后，默认值（40）下窗口内的相似热词可能被较旧的热词挤掉
+    FILTERED_EF_SEARCH = 400
+
+    # 数据库的 pgvector 是否支持迭代索引扫描（>= 0.8.0），首次使用时检测
+    _iterative_scan_supported: Optional[bool] = None
+
     def __init__(self):
         """初始化热点服务"""
         pass
 
+    async def _set_filtered_search_params(self, conn):
+        """
+        为带时间窗口过滤的 HNSW 查询设置事务级搜索参数（需在事务内调用）
+
+        提高 ef_search；pgvector >= 0.8.0 时同时开启迭代扫描（relaxed_order），
+        过滤后结果不足时索引会继续扫描，而不是只返回 ef_search 范围内的行。
+        候选在外层查询中按 float32 向量重新排序，因此 relaxed_order 不影响结果顺序
+
+        Args:
+            conn: 数据库连接（处于事务中）
+        """
+        if HotspotService._iterative_scan_supported is None:
+            version = await conn.fetchval(
+                "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+            )
+            try:
+                major, minor = (int(part) for part in (version or "0.0").split(".")[:2])
+            except ValueError:
+                major, minor = 0, 0
+            HotspotService._iterative_scan_supported = (major, minor) >= (0, 8)
+
+        await conn.execute(
+            "SELECT set_config('hnsw.ef_search', $1, true)",
+            str(self.FILTERED_EF_SEARCH),
+        )
+        if HotspotService._iterative_scan_supported:
+            await conn.execute(
+                "SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)"
+            )
+
     def _parse_viewnum(self, viewnum_str: str) -> int:
         """
         解析热度值（将 "541.2万" 这样的字符串转换为数字）
@@ -41,14 +169,10 @@ class HotspotService:
         # 去除空格
         viewnum_str = viewnum_str.strip()
 
-        # 处理万、亿等单位
-        multiplier = 1
-        if "亿" in viewnum_str:
-            multiplier = 100000000
-            viewnum_str = viewnum_str.replace("亿", "")
-        elif "万" in viewnum_str:
-            multiplier = 10000
-            viewnum_str = viewnum_str.replace("万", "")
+        # 处理万、亿等单位（只检查末尾字符）
+        multiplier = _VIEWNUM_UNIT.get(viewnum_str[-1:], 1)
+        if multiplier != 1:
+            viewnum_str = viewnum_str[:-1]
 
         # 转换为浮点数并乘以倍数
         try:
@@ -56,6 +180,378 @@ class HotspotService:
         except ValueError:
             return 0
 
+    def _build_update_args(
+        self,
+        hotspot_id: int,
+        analysis: KeywordAnalysis,
+        platform_data: Optional[PlatformDataInput],
+    ) -> Tuple:
+        """
+        构建更新已有热点 AI 分析信息的参数（对应 _UPDATE_FROM_ANALYSIS_SQL）
+
+        Args:
+            hotspot_id: 热点ID
+            analysis: AI返回的热词分析结果
+            platform_data: 平台原始数据
+
+        Returns:
+            SQL 参数元组
+        """
+        # 提取平台 URL 和 word_cover（如果有）
+        platform_url = platform_data.url if platform_data else None
+        word_cover = platform_data.word_cover if platform_data else None
+
+        return (
+            hotspot_id,
+            analysis.tags if analysis.tags else [],
+            analysis.confidence,
+            analysis.opportunities if analysis.opportunities else [],
+            analysis.reasoning.keep if analysis.reasoning.keep else [],
+            analysis.reasoning.risk if analysis.reasoning.risk else [],
+            analysis.primary_category,
+            platform_url,
+            _json_dumps(word_cover) if word_cover else None,
+        )
+
+    def _build_insert_args(
+        self,
+        analysis: KeywordAnalysis,
+        platform_data: Optional[PlatformDataInput],
+        embedding: List[float],
+        cluster_id: Optional[int],
+    ) -> Tuple:
+        """
+        构建新热点的插入参数（对应 _INSERT_HOTSPOT_SQL；批量插入时按列转置后用于 _INSERT_HOTSPOTS_BATCH_SQL）
+
+        Args:
+            analysis: AI返回的热词分析结果
+            platform_data: 平台原始数据
+            embedding: 热词向量
+            cluster_id: 关联的簇ID
+
+        Returns:
+            SQL 参数元组
+        """
+        # 构建平台信息（从传入的平台数据中提取）
+        if platform_data:
+            platform_type = platform_data.type
+            platform_name = _PLATFORM_NAME_MAP.get(platform_type, platform_type)
+
+            # 解析热度值（去除万、亿等单位）
+            viewnum_str = platform_data.viewnum or "0"
+            heat_score = self._parse_viewnum(viewnum_str)
+
+            # 安全地转换 rank,处理空字符串的情况
+            rank_value = platform_data.rank
+            rank = int(rank_value) if rank_value and str(rank_value).strip() else 0
+
+            platforms = [
+                {
+                    "platform": platform_name,
+                    "rank": rank,
+                    "heat_score": heat_score,
+                    "seen_at": platform_data.date or datetime.now().isoformat(),
+                }
+            ]
+        else:
+            # 如果没有平台数据，使用默认值
+            platforms = [
+                {
+                    "platform": "unknown",
+                    "rank": 0,
+                    "heat_score": int(analysis.confidence * 100),
+                    "seen_at": datetime.now().isoformat(),
+                }
+            ]
+
+        # 根据是否低价值词决定状态和过滤信息
+        if analysis.is_remove:
+            # 低价值词：状态设为 rejected，记录拒绝原因
+            status = HotspotStatus.REJECTED.value
+            is_filtered = True
+            filter_reason = "; ".join(analysis.reasoning.risk)
+            filtered_at = datetime.now()
+        else:
+            # 有价值词：状态设为 pending_validation
+            status = HotspotStatus.PENDING_VALIDATION.value
+            is_filtered = False
+            filter_reason = None
+            filtered_at = None
+
+        # 提取平台 URL 和 word_cover
+        platform_url = platform_data.url if platform_data else None
+        word_cover = platform_data.word_cover if platform_data else None
+
+        return (
+            analysis.title,
+            analysis.title.lower().strip(),
+            embedding,
+            vector_service.EMBEDDING_MODEL,
+            cluster_id,  # 添加cluster_id
+            1,
+            _json_dumps(platforms),
+            status,
+            is_filtered,
+            filter_reason,
+            filtered_at,
+            # AI 分析详细信息
+            analysis.tags if analysis.tags else [],
+            analysis.confidence,
+            analysis.opportunities if analysis.opportunities else [],
+            analysis.reasoning.keep if analysis.reasoning.keep else [],
+            analysis.reasoning.risk if analysis.reasoning.risk else [],
+            platform_url,
+            analysis.primary_category,
+            _json_dumps(word_cover) if word_cover else None,
+        )
+
+    def _build_add_result(
+        self, analysis: KeywordAnalysis, hotspot_id: int, cluster_id: Optional[int]
+    ) -> Dict[str, Any]:
+        """构建新增热点的返回结果"""
+        action = "rejected" if analysis.is_remove else "created"
+        status_text = "已拒绝" if analysis.is_remove else "创建成功"
+
+        # 如果自动关联到了cluster，在消息中说明
+        cluster_info = f"（已关联到簇 {cluster_id}）" if cluster_id else ""
+
+        return {
+            "hotspot_id": hotspot_id,
+            "action": action,
+            "message": f"热点 '{analysis.title}' {status_text} (ID: {hotspot_id}){cluster_info}",
+        }
+
+    async def _resolve_cluster(
+        self, conn, title: str, embedding: List[float]
+    ) -> Tuple[int, bool]:
+        """
+        为新热词确定所属的 cluster
+
+        检查是否存在高相似度的热词(>=85%)，如果存在则关联到同一个cluster；
+        如果不存在相似的热词，则为该热词创建一个新的独立cluster
+
+        Args:
+            conn: 数据库连接
+            title: 热词名称
+            embedding: 热词向量
+
+        Returns:
+            (cluster_id, 是否为该热词新建的独立 cluster)
+        """
+        cluster_id = None
+
+        # 时间窗口由数据库计算（NOW()），避免应用与数据库的时钟偏差
+        # 先用 halfvec 列的 HNSW 索引召回候选，再用 float32 向量精确重排
+        # 相似度阈值(>=85%)在数据库侧过滤，没有相似热词时（最常见情况）不返回任何行
+        # 时间过滤在索引扫描之后执行，在事务内调整 HNSW 搜索参数保证召回
+        async with conn.transaction():
+            await self._set_filtered_search_params(conn)
+            similar_record = await conn.fetchrow(
+                """
+                WITH candidates AS (
+                    SELECT id, keyword, cluster_id, embedding
+                    FROM hotspots
+                    WHERE last_seen_at >= NOW() - INTERVAL '7 days'
+                        AND embedding_h IS NOT NULL
+                    ORDER BY embedding_h <#> $1::vector::halfvec
+                    LIMIT $2
+                )
+                SELECT id, keyword, cluster_id
+                FROM candidates
+                WHERE (embedding <#> $1) < $3
+                ORDER BY embedding <#> $1
+                LIMIT 1
+                """,
+                embedding,
+                self.RERANK_CANDIDATES,
+                -self.HIGH_SIMILARITY_THRESHOLD,  # 因为使用负内积，所以取负值
+            )
+
+        # 存在相似度 >= 85% 的热词，关联到同一个cluster
+        if similar_record:
+            existing_cluster_id = similar_record["cluster_id"]
+
+            if existing_cluster_id:
+                # 使用已存在的cluster
+                cluster_id = existing_cluster_id
+                # 更新cluster的成员列表
+                await conn.execute(
+                    """
+                    UPDATE hotspot_clusters
+                    SET keywords = keywords || $1::jsonb,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = $2
+                    """,
+                    _json_dumps([title]),
+                    cluster_id,
+                )
+            else:
+                # 创建新的cluster，并将两个热词都加入
+                # 同时更新已存在的相似热词的cluster_id（单条 CTE 语句，原子执行）
+                cluster_id = await conn.fetchval(
+                    """
+                    WITH new_cluster AS (
+                        INSERT INTO hotspot_clusters (cluster_name, keywords)
+                        VALUES ($1, $2)
+                        RETURNING id
+                    ), updated AS (
+                        UPDATE hotspots
+                        SET cluster_id = (SELECT id FROM new_cluster),
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE id = $3
+                        RETURNING 1
+                    )
+                    SELECT id FROM new_cluster
+                    """,
+                    similar_record["keyword"],  # 使用第一个热词作为cluster名称
+                    _json_dumps([similar_record["keyword"], title]),
+                    similar_record["id"],
+                )
+
+        # 如果没有找到相似的热词，创建一个新的独立cluster
+        # 注意：selected_hotspot_id 将在创建热点后设置
+        create_new_cluster = cluster_id is None
+        if create_new_cluster:
+            cluster_id = await conn.fetchval(
+                """
+                INSERT INTO hotspot_clusters (cluster_name, keywords)
+                VALUES ($1, $2)
+                RETURNING id
+                """,
+                title,  # 使用热词本身作为cluster名称
+                _json_dumps([title]),
+            )
+
+        return cluster_id, create_new_cluster
+
+    async def _resolve_clusters_batch(
+        self, conn, titles: List[str], embeddings: List[List[float]]
+    ) -> List[Tuple[int, bool]]:
+        """
+        批量为新热词确定所属的 cluster（与 _resolve_cluster 规则一致，按集合执行）
+
+        一条 LATERAL 查询为所有热词找出库中最相似（>=85%）的热词，然后：
+        - 相似热词已有 cluster：把新热词追加到该 cluster
+        - 相似热词没有 cluster：为其新建 cluster，命中同一热词的新热词都加入其中
+        - 没有相似热词：为新热词各自新建独立 cluster
+        同一批次内的新热词之间不做相似度聚簇（相似度只与库中已有热词比较）
+
+        需在事务内调用（HNSW 搜索参数为事务级设置）
+
+        Args:
+            conn: 数据库连接（处于事务中）
+            titles: 新热词名称列表（互不重复）
+            embeddings: 与 titles 一一对应的向量
+
+        Returns:
+            与 titles 顺序一致的 (cluster_id, 是否为该热词新建的独立 cluster) 列表
+        """
+        await self._set_filtered_search_params(conn)
+        similar_records = await conn.fetch(
+            """
+            SELECT t.idx, s.id, s.keyword, s.cluster_id
+            FROM unnest($1::vector[]) WITH ORDINALITY AS t(embedding, idx)
+            CROSS JOIN LATERAL (
+                SELECT c.id, c.keyword, c.cluster_id
+                FROM (
+                    SELECT id, keyword, cluster_id, embedding
+                    FROM hotspots
+                    WHERE last_seen_at >= NOW() - INTERVAL '7 days'
+                        AND embedding_h IS NOT NULL
+                    ORDER BY embedding_h <#> t.embedding::halfvec
+                    LIMIT $2
+                ) c
+                WHERE (c.embedding <#> t.embedding) < $3
+                ORDER BY c.embedding <#> t.embedding
+                LIMIT 1
+            ) s
+            """,
+            embeddings,
+            self.RERANK_CANDIDATES,
+            -self.HIGH_SIMILARITY_THRESHOLD,  # 因为使用负内积，所以取负值
+        )
+        similar_by_index = {r["idx"] - 1: r for r in similar_records}
+
+        # 按命中的已有 cluster / 已有热词分组
+        append_titles: Dict[int, List[str]] = {}
+        grouped_titles: Dict[int, List[str]] = {}
+        similar_keywords: Dict[int, str] = {}
+        for i, title in enumerate(titles):
+            record = similar_by_index.get(i)
+            if record is None:
+                continue
+            if record["cluster_id"]:
+                append_titles.setdefault(record["cluster_id"], []).append(title)
+            else:
+                grouped_titles.setdefault(record["id"], []).append(title)
+                similar_keywords[record["id"]] = record["keyword"]
+
+        # 更新已有cluster的成员列表
+        if append_titles:
+            await conn.execute(
+                """
+                UPDATE hotspot_clusters AS c
+                SET keywords = c.keywords || v.keywords,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM unnest($1::bigint[], $2::jsonb[]) AS v(id, keywords)
+                WHERE c.id = v.id
+                """,
+                list(append_titles),
+                [_json_dumps(group) for group in append_titles.values()],
+            )
+
+        # 一条语句创建所有新cluster：
+        # 相似热词没有cluster时以该热词命名（成员为该热词和命中它的新热词），其余以新热词本身命名
+        # 已有热词与新热词的名称互不重复，按名称映射回 cluster_id
+        standalone_titles = [
+            title for i, title in enumerate(titles) if i not in similar_by_index
+        ]
+        cluster_names = [similar_keywords[hid] for hid in grouped_titles]
+        cluster_names.extend(standalone_titles)
+        cluster_keywords = [
+            _json_dumps([similar_keywords[hid], *group])
+            for hid, group in grouped_titles.items()
+        ]
+        cluster_keywords.extend(_json_dumps([title]) for title in standalone_titles)
+
+        new_cluster_ids: Dict[str, int] = {}
+        if cluster_names:
+            created_records = await conn.fetch(
+                """
+                INSERT INTO hotspot_clusters (cluster_name, keywords)
+                SELECT * FROM unnest($1::text[], $2::jsonb[])
+                RETURNING id, cluster_name
+                """,
+                cluster_names,
+                cluster_keywords,
+            )
+            new_cluster_ids = {r["cluster_name"]: r["id"] for r in created_records}
+
+        # 已存在的相似热词关联到为其新建的cluster
+        if grouped_titles:
+            await conn.execute(
+                """
+                UPDATE hotspots AS h
+                SET cluster_id = v.cluster_id,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM unnest($1::bigint[], $2::bigint[]) AS v(id, cluster_id)
+                WHERE h.id = v.id
+                """,
+                list(grouped_titles),
+                [new_cluster_ids[similar_keywords[hid]] for hid in grouped_titles],
+            )
+
+        results: List[Tuple[int, bool]] = []
+        for i, title in enumerate(titles):
+            record = similar_by_index.get(i)
+            if record is None:
+                results.append((new_cluster_ids[title], True))
+            elif record["cluster_id"]:
+                results.append((record["cluster_id"], False))
+            else:
+                results.append((new_cluster_ids[record["keyword"]], False))
+        return results
+
     async def add_keyword_from_analysis(
         self,
         analysis: KeywordAnalysis,
@@ -79,36 +575,12 @@ class HotspotService:
             )
 
             if existing_hotspot:
-                # 提取平台 URL 和 word_cover（如果有）
-                platform_url = platform_data.url if platform_data else None
-                word_cover = platform_data.word_cover if platform_data else None
-
                 # 更新现有热点的 AI 分析信息、平台 URL 和 word_cover
                 await conn.execute(
-                    """
-                    UPDATE hotspots
-                    SET last_seen_at = CURRENT_TIMESTAMP,
-                        appearance_count = appearance_count + 1,
-                        updated_at = CURRENT_TIMESTAMP,
-                        tags = $2,
-                        confidence = $3,
-                        opportunities = $4,
-                        reasoning_keep = $5,
-                        reasoning_risk = $6,
-                        primary_category = $7,
-                        platform_url = COALESCE($8, platform_url),
-                        word_cover = COALESCE($9, word_cover)
-                    WHERE id = $1
-                    """,
-                    existing_hotspot["id"],
-                    analysis.tags if analysis.tags else [],
-                    analysis.confidence,
-                    analysis.opportunities if analysis.opportunities else [],
-                    analysis.reasoning.keep if analysis.reasoning.keep else [],
-                    analysis.reasoning.risk if analysis.reasoning.risk else [],
-                    analysis.primary_category,
-                    platform_url,
-                    json.dumps(word_cover) if word_cover else None,
+                    _UPDATE_FROM_ANALYSIS_SQL,
+                    *self._build_update_args(
+                        existing_hotspot["id"], analysis, platform_data
+                    ),
                 )
 
                 return {
@@ -121,184 +593,13 @@ class HotspotService:
             # 生成向量
             embedding = await vector_service.generate_embedding(analysis.title)
 
-            # 检查是否存在高相似度的热词(>=85%)，如果存在则关联到同一个cluster
-            # 如果不存在相似的热词，则为该热词创建一个新的独立cluster
-            cluster_id = None
-            seven_days_ago = datetime.now() - timedelta(days=7)
-
-            similar_records = await conn.fetch(
-                """
-                SELECT
-                    id, keyword, cluster_id,
-                    (embedding <#> $1) * -1 as similarity
-                FROM hotspots
-                WHERE last_seen_at >= $2
-                    AND embedding IS NOT NULL
-                    AND (embedding <#> $1) < $3
-                ORDER BY similarity DESC
-                LIMIT 1
-                """,
-                embedding,
-                seven_days_ago,
-                -self.HIGH_SIMILARITY_THRESHOLD,  # >= 85%
+            cluster_id, create_new_cluster = await self._resolve_cluster(
+                conn, analysis.title, embedding
             )
 
-            if similar_records:
-                similar_record = similar_records[0]
-                similarity = similar_record["similarity"]
-
-                # 如果相似度 >= 85%，关联到同一个cluster
-                if similarity >= self.HIGH_SIMILARITY_THRESHOLD:
-                    existing_cluster_id = similar_record["cluster_id"]
-
-                    if existing_cluster_id:
-                        # 使用已存在的cluster
-                        cluster_id = existing_cluster_id
-                        # 更新cluster的成员列表
-                        await conn.execute(
-                            """
-                            UPDATE hotspot_clusters
-                            SET keywords = keywords || $1::jsonb,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE id = $2
-                            """,
-                            json.dumps([analysis.title]),
-                            cluster_id,
-                        )
-                    else:
-                        # 创建新的cluster，并将两个热词都加入
-                        cluster_id = await conn.fetchval(
-                            """
-                            INSERT INTO hotspot_clusters (cluster_name, keywords)
-                            VALUES ($1, $2)
-                            RETURNING id
-                            """,
-                            similar_record["keyword"],  # 使用第一个热词作为cluster名称
-                            json.dumps([similar_record["keyword"], analysis.title]),
-                        )
-
-                        # 更新已存在的相似热词的cluster_id
-                        await conn.execute(
-                            """
-                            UPDATE hotspots
-                            SET cluster_id = $1,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE id = $2
-                            """,
-                            cluster_id,
-                            similar_record["id"],
-                        )
-
-            # 如果没有找到相似的热词，创建一个新的独立cluster
-            # 注意：selected_hotspot_id 将在创建热点后设置
-            create_new_cluster = cluster_id is None
-            if create_new_cluster:
-                cluster_id = await conn.fetchval(
-                    """
-                    INSERT INTO hotspot_clusters (cluster_name, keywords)
-                    VALUES ($1, $2)
-                    RETURNING id
-                    """,
-                    analysis.title,  # 使用热词本身作为cluster名称
-                    json.dumps([analysis.title]),
-                )
-
-            # 平台名称映射
-            platform_name_map = {
-                "xhs": "小红书",
-                "dy": "抖音",
-                "bili": "哔哩哔哩",
-                "ks": "快手",
-                "wb": "微博",
-                "tieba": "贴吧",
-                "zhihu": "知乎",
-            }
-
-            # 构建平台信息（从传入的平台数据中提取）
-            if platform_data:
-                platform_type = platform_data.type
-                platform_name = platform_name_map.get(platform_type, platform_type)
-
-                # 解析热度值（去除万、亿等单位）
-                viewnum_str = platform_data.viewnum or "0"
-                heat_score = self._parse_viewnum(viewnum_str)
-
-                # 安全地转换 rank,处理空字符串的情况
-                rank_value = platform_data.rank
-                rank = int(rank_value) if rank_value and str(rank_value).strip() else 0
-
-                platforms = [
-                    {
-                        "platform": platform_name,
-                        "rank": rank,
-                        "heat_score": heat_score,
-                        "seen_at": platform_data.date or datetime.now().isoformat(),
-                    }
-                ]
-            else:
-                # 如果没有平台数据，使用默认值
-                platforms = [
-                    {
-                        "platform": "unknown",
-                        "rank": 0,
-                        "heat_score": int(analysis.confidence * 100),
-                        "seen_at": datetime.now().isoformat(),
-                    }
-                ]
-
-            # 根据是否低价值词决定状态和过滤信息
-            if analysis.is_remove:
-                # 低价值词：状态设为 rejected，记录拒绝原因
-                status = HotspotStatus.REJECTED.value
-                is_filtered = True
-                filter_reason = "; ".join(analysis.reasoning.risk)
-                filtered_at = datetime.now()
-            else:
-                # 有价值词：状态设为 pending_validation
-                status = HotspotStatus.PENDING_VALIDATION.value
-                is_filtered = False
-                filter_reason = None
-                filtered_at = None
-
-            # 提取平台 URL 和 word_cover
-            platform_url = platform_data.url if platform_data else None
-            word_cover = platform_data.word_cover if platform_data else None
-
-            now = datetime.now()
             hotspot_id = await conn.fetchval(
-                """
-                INSERT INTO hotspots (
-                    keyword, normalized_keyword, embedding, embedding_model,
-                    cluster_id, first_seen_at, last_seen_at, appearance_count, platforms,
-                    status, is_filtered, filter_reason, filtered_at,
-                    tags, confidence, opportunities, reasoning_keep, reasoning_risk, 
-                    platform_url, primary_category, word_cover
-                )
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19, $20, $21)
-                RETURNING id
-                """,
-                analysis.title,
-                analysis.title.lower().strip(),
-                embedding,
-                vector_service.EMBEDDING_MODEL,
-                cluster_id,  # 添加cluster_id
-                now,
-                now,
-                1,
-                json.dumps(platforms),
-                status,
-                is_filtered,
-                filter_reason,
-                filtered_at,
-                # AI 分析详细信息
-                analysis.tags if analysis.tags else [],
-                analysis.confidence,
-                analysis.opportunities if analysis.opportunities else [],
-                analysis.reasoning.keep if analysis.reasoning.keep else [],
-                analysis.reasoning.risk if analysis.reasoning.risk else [],
-                platform_url,
-                analysis.primary_category,
-                json.dumps(word_cover) if word_cover else None,
+                _INSERT_HOTSPOT_SQL + " RETURNING id",
+                *self._build_insert_args(analysis, platform_data, embedding, cluster_id),
             )
 
             # 如果创建了新的聚簇，将当前热点设置为该聚簇的代表热点
@@ -314,17 +615,129 @@ class HotspotService:
                     cluster_id,
                 )
 
-            action = "rejected" if analysis.is_remove else "created"
-            status_text = "已拒绝" if analysis.is_remove else "创建成功"
+            return self._build_add_result(analysis, hotspot_id, cluster_id)
 
-            # 如果自动关联到了cluster，在消息中说明
-            cluster_info = f"（已关联到簇 {cluster_id}）" if cluster_id else ""
+    async def add_keywords_from_analysis_batch(
+        self,
+        items: List[Tuple[KeywordAnalysis, Optional[PlatformDataInput]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        批量根据AI分析结果添加热词
 
-            return {
-                "hotspot_id": hotspot_id,
-                "action": action,
-                "message": f"热点 '{analysis.title}' {status_text} (ID: {hotspot_id}){cluster_info}",
-            }
+        与逐条调用 add_keyword_from_analysis 的语义一致，但只占用一个连接：
+        新热词的向量通过一次 embedding 请求批量生成，聚簇通过 _resolve_clusters_batch
+        按集合确定，新热词通过一条 INSERT ... SELECT FROM unnest 写入；
+        所有写操作在同一个事务中执行，失败时整批回滚。
+
+        注意：同一批次内的新热词之间不做相似度聚簇（相似度只与库中已有热词比较）
+
+        Args:
+            items: (AI分析结果, 平台原始数据) 列表
+
+        Returns:
+            与 items 顺序一致的结果列表，每项包含 hotspot_id, action, message
+        """
+        if not items:
+            return []
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+
+        async with session.pg_pool.acquire() as conn:
+            # 一次查询检查所有热词是否已存在
+            existing_records = await conn.fetch(
+                "SELECT id, keyword FROM hotspots WHERE keyword = ANY($1::text[])",
+                list({analysis.title for analysis, _ in items}),
+            )
+            hotspot_ids = {r["keyword"]: r["id"] for r in existing_records}
+
+            update_indexes: List[int] = []
+            new_indexes: List[int] = []
+            new_titles = set()
+            for i, (analysis, _) in enumerate(items):
+                if analysis.title in hotspot_ids or analysis.title in new_titles:
+                    # 已存在，或与本批次中较早的新热词重复：插入之后再更新
+                    update_indexes.append(i)
+                else:
+                    new_titles.add(analysis.title)
+                    new_indexes.append(i)
+
+            embeddings: List[List[float]] = []
+            if new_indexes:
+                # 批量生成向量（在事务外完成，避免网络请求期间持有事务）
+                embeddings = await vector_service.generate_embeddings(
+                    [items[i][0].title for i in new_indexes]
+                )
+
+            async with conn.transaction():
+                if new_indexes:
+                    cluster_ids = await self._resolve_clusters_batch(
+                        conn, [items[i][0].title for i in new_indexes], embeddings
+                    )
+
+                    insert_args = [
+                        self._build_insert_args(
+                            items[i][0], items[i][1], embedding, cluster_id
+                        )
+                        for i, embedding, (cluster_id, _) in zip(
+                            new_indexes, embeddings, cluster_ids
+                        )
+                    ]
+                    inserted_records = await conn.fetch(
+                        _INSERT_HOTSPOTS_BATCH_SQL,
+                        *(list(column) for column in zip(*insert_args)),
+                    )
+                    hotspot_ids.update(
+                        {r["keyword"]: r["id"] for r in inserted_records}
+                    )
+
+                    # 新建的独立聚簇以对应热点作为代表热点
+                    selected = [
+                        (hotspot_ids[items[i][0].title], cluster_id)
+                        for i, (cluster_id, create_new_cluster) in zip(
+                            new_indexes, cluster_ids
+                        )
+                        if create_new_cluster
+                    ]
+                    if selected:
+                        await conn.execute(
+                            """
+                            UPDATE hotspot_clusters AS c
+                            SET selected_hotspot_id = v.hotspot_id,
+                                updated_at = CURRENT_TIMESTAMP
+                            FROM unnest($1::bigint[], $2::bigint[]) AS v(hotspot_id, id)
+                            WHERE c.id = v.id
+                            """,
+                            [hotspot_id for hotspot_id, _ in selected],
+                            [cluster_id for _, cluster_id in selected],
+                        )
+
+                    for i, (cluster_id, _) in zip(new_indexes, cluster_ids):
+                        analysis = items[i][0]
+                        results[i] = self._build_add_result(
+                            analysis, hotspot_ids[analysis.title], cluster_id
+                        )
+
+                if update_indexes:
+                    # 批量更新已有热点的 AI 分析信息、平台 URL 和 word_cover
+                    await conn.executemany(
+                        _UPDATE_FROM_ANALYSIS_SQL,
+                        [
+                            self._build_update_args(
+                                hotspot_ids[items[i][0].title], *items[i]
+                            )
+                            for i in update_indexes
+                        ],
+                    )
+
+                    for i in update_indexes:
+                        analysis = items[i][0]
+                        results[i] = {
+                            "hotspot_id": hotspot_ids[analysis.title],
+                            "action": "updated",
+                            "message": f"热点 '{analysis.title}' 已更新（包括 AI 分析信息）",
+                        }
+
+        return results
 
     async def check_hotspot_exists(self, keyword: str) -> Dict[str, Any]:
         """
@@ -383,37 +796,50 @@ class HotspotService:
             # 2. 生成向量进行相似度搜索
             embedding = await vector_service.generate_embedding(keyword)
 
-            # 搜索相似热词（最近7天内）
-            seven_days_ago = datetime.now() - timedelta(days=7)
-
-            similar_records = await conn.fetch(
-                """
-                SELECT
-                    id, keyword, normalized_keyword, status,
-                    first_seen_at, last_seen_at, appearance_count, cluster_id,
-                    (embedding <#> $1) * -1 as similarity
-                FROM hotspots
-                WHERE last_seen_at >= $2
-                    AND embedding IS NOT NULL
-                    AND (embedding <#> $1) < $3
-                ORDER BY similarity DESC
-                LIMIT 5
-                """,
-                embedding,
-                seven_days_ago,
-                -self.SIMILAR_THRESHOLD,  # 因为使用负内积，所以取负值
-            )
+            # 搜索相似热词（最近7天内，时间窗口由数据库计算）
+            # 先用 halfvec 列的 HNSW 索引召回候选，再用 float32 向量精确重排
+            # 相似度阈值在返回结果上过滤
+            # 时间过滤在索引扫描之后执行，在事务内调整 HNSW 搜索参数保证召回
+            async with conn.transaction():
+                await self._set_filtered_search_params(conn)
+                similar_records = await conn.fetch(
+                    """
+                    WITH candidates AS (
+                        SELECT id, keyword, normalized_keyword, status,
+                               first_seen_at, last_seen_at, appearance_count, cluster_id,
+                               embedding
+                        FROM hotspots
+                        WHERE last_seen_at >= NOW() - INTERVAL '7 days'
+                            AND embedding_h IS NOT NULL
+                        ORDER BY embedding_h <#> $1::vector::halfvec
+                        LIMIT $2
+                    )
+                    SELECT
+                        id, keyword, normalized_keyword, status,
+                        first_seen_at, last_seen_at, appearance_count, cluster_id,
+                        (embedding <#> $1) * -1 as similarity
+                    FROM candidates
+                    ORDER BY similarity DESC
+                    LIMIT 5
+                    """,
+                    embedding,
+                    self.RERANK_CANDIDATES,
+                )
+            similar_records = [
+                r for r in similar_records if r["similarity"] >= self.SIMILAR_THRESHOLD
+            ]
 
+            # 数据直接来自类型明确的数据库查询，跳过 Pydantic 校验
             similar_hotspots = [
-                SimilarHotspot(
+                SimilarHotspot.model_construct(
                     id=r["id"],
                     keyword=r["keyword"],
                     normalized_keyword=r["normalized_keyword"],
-                    status=HotspotStatus(r["status"]),
+                    status=_STATUS_BY_VALUE[r["status"]],
                     first_seen_at=r["first_seen_at"],
                     last_seen_at=r["last_seen_at"],
                     appearance_count=r["appearance_count"],
-                    similarity=float(r["similarity"]),
+                    similarity=r["similarity"],
                     cluster_id=r["cluster_id"],
                 )
                 for r in similar_records
@@ -584,16 +1010,12 @@ class HotspotService:
 
                 where_clause = " AND ".join(conditions) if conditions else "1=1"
 
-                # 查询总数
-                total = await conn.fetchval(
-                    f"SELECT COUNT(*) FROM hotspots WHERE {where_clause}", *params
-                )
-
-                # 查询数据
+                # 查询数据（总数通过窗口函数一并返回）
                 offset = (page - 1) * page_size
                 records = await conn.fetch(
                     f"""
-                    SELECT * FROM hotspots
+                    SELECT COUNT(*) OVER() as total_count, *
+                    FROM hotspots
                     WHERE {where_clause}
                     ORDER BY last_seen_at DESC
                     LIMIT ${param_idx} OFFSET ${param_idx + 1}
@@ -602,6 +1024,7 @@ class HotspotService:
                     page_size,
                     offset,
                 )
+                total = records[0]["total_count"] if records else 0
 
             items = [
                 HotspotDetail(
@@ -616,12 +1039,12 @@ class HotspotService:
                     platforms=[
                         PlatformInfo(**p)
                         for p in (
-                            json.loads(r["platforms"])
+                            orjson.loads(r["platforms"])
                             if isinstance(r["platforms"], str)
                             else r["platforms"]
                         )
                     ],
-                    status=HotspotStatus(r["status"]),
+                    status=_STATUS_BY_VALUE[r["status"]],
                     last_crawled_at=r["last_crawled_at"],
                     crawl_count=r["crawl_count"],
                     crawl_started_at=r["crawl_started_at"],
@@ -646,7 +1069,7 @@ class HotspotService:
                     platform_url=r.get("platform_url"),
                     primary_category=r.get("primary_category"),
                     word_cover=(
-                        json.loads(r.get("word_cover"))
+                        orjson.loads(r.get("word_cover"))
                         if r.get("word_cover") and isinstance(r.get("word_cover"), str)
                         else r.get("word_cover")
                     ),
@@ -672,12 +1095,11 @@ class HotspotService:
             包含 success, message 的字典
         """
         async with session.pg_pool.acquire() as conn:
-            result = await conn.execute(
-                "DELETE FROM hotspots WHERE id = $1", hotspot_id
+            deleted = await conn.fetchval(
+                "DELETE FROM hotspots WHERE id = $1 RETURNING 1", hotspot_id
             )
 
-            deleted_count = int(result.split()[-1])
-            if deleted_count == 0:
+            if not deleted:
                 raise ValueError(f"热点 {hotspot_id} 不存在")
 
             return {"success": True, "message": f"热点 {hotspot_id} 已删除"}
@@ -710,12 +1132,12 @@ class HotspotService:
                 platforms=[
                     PlatformInfo(**p)
                     for p in (
-                        json.loads(r["platforms"])
+                        orjson.loads(r["platforms"])
                         if isinstance(r["platforms"], str)
                         else r["platforms"]
                     )
                 ],
-                status=HotspotStatus(r["status"]),
+                status=_STATUS_BY_VALUE[r["status"]],
                 last_crawled_at=r["last_crawled_at"],
                 crawl_count=r["crawl_count"],
                 crawl_started_at=r["crawl_started_at"],
@@ -738,7 +1160,7 @@ class HotspotService:
                 platform_url=r.get("platform_url"),
                 primary_category=r.get("primary_category"),
                 word_cover=(
-                    json.loads(r.get("word_cover"))
+                    orjson.loads(r.get("word_cover"))
                     if r.get("word_cover") and isinstance(r.get("word_cover"), str)
                     else r.get("word_cover")
                 ),
@@ -777,12 +1199,12 @@ class HotspotService:
                     platforms=[
                         PlatformInfo(**p)
                         for p in (
-                            json.loads(r["platforms"])
+                            orjson.loads(r["platforms"])
                             if isinstance(r["platforms"], str)
                             else r["platforms"]
                         )
                     ],
-                    status=HotspotStatus(r["status"]),
+                    status=_STATUS_BY_VALUE[r["status"]],
                     last_crawled_at=r["last_crawled_at"],
                     crawl_count=r["crawl_count"],
                     crawl_started_at=r["crawl_started_at"],
@@ -807,7 +1229,7 @@ class HotspotService:
                     platform_url=r.get("platform_url"),
                     primary_category=r.get("primary_category"),
                     word_cover=(
-                        json.loads(r.get("word_cover"))
+                        orjson.loads(r.get("word_cover"))
                         if r.get("word_cover") and isinstance(r.get("word_cover"), str)
                         else r.get("word_cover")
                     ),
@@ -830,29 +1252,26 @@ class HotspotService:
         """
         async with session.pg_pool.acquire() as conn:
             async with conn.transaction():
-                # 获取源热点信息
+                # 获取源热点信息，同时检查新关键词是否已存在（一次往返）
                 source_hotspot = await conn.fetchrow(
                     """
                     SELECT keyword, normalized_keyword, cluster_id, platforms,
-                           status, is_filtered, filter_reason, filtered_at
+                           status, is_filtered, filter_reason, filtered_at,
+                           (SELECT id FROM hotspots WHERE keyword = $2) as existing_id
                     FROM hotspots
                     WHERE id = $1
                     """,
                     source_hotspot_id,
+                    keyword,
                 )
 
                 if not source_hotspot:
                     raise ValueError(f"源热点 {source_hotspot_id} 不存在")
 
-                # 检查新关键词是否已存在
-                existing = await conn.fetchrow(
-                    "SELECT id FROM hotspots WHERE keyword = $1", keyword
-                )
-
-                if existing:
+                if source_hotspot["existing_id"]:
                     return {
                         "success": False,
-                        "hotspot_id": existing["id"],
+                        "hotspot_id": source_hotspot["existing_id"],
                         "cluster_id": source_hotspot["cluster_id"],
                         "message": f"关键词 '{keyword}' 已存在，无法关联",
                     }
@@ -872,36 +1291,34 @@ class HotspotService:
                             updated_at = CURRENT_TIMESTAMP
                         WHERE id = $2
                         """,
-                        json.dumps([keyword]),
+                        _json_dumps([keyword]),
                         cluster_id,
                     )
                 else:
-                    # 创建新 cluster，包含源热点和新热点
+                    # 创建新 cluster，包含源热点和新热点，并更新源热点的 cluster_id
                     cluster_id = await conn.fetchval(
                         """
-                        INSERT INTO hotspot_clusters (cluster_name, keywords)
-                        VALUES ($1, $2)
-                        RETURNING id
+                        WITH new_cluster AS (
+                            INSERT INTO hotspot_clusters (cluster_name, keywords)
+                            VALUES ($1, $2)
+                            RETURNING id
+                        ), updated AS (
+                            UPDATE hotspots
+                            SET cluster_id = (SELECT id FROM new_cluster),
+                                updated_at = CURRENT_TIMESTAMP
+                            WHERE id = $3
+                            RETURNING 1
+                        )
+                        SELECT id FROM new_cluster
                         """,
                         source_hotspot["keyword"],  # 使用源热点作为 cluster 名称
-                        json.dumps([source_hotspot["keyword"], keyword]),
-                    )
-
-                    # 更新源热点的 cluster_id
-                    await conn.execute(
-                        """
-                        UPDATE hotspots
-                        SET cluster_id = $1,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE id = $2
-                        """,
-                        cluster_id,
+                        _json_dumps([source_hotspot["keyword"], keyword]),
                         source_hotspot_id,
                     )
 
                 # 复用源热点的平台信息（作为初始值）
                 platforms = (
-                    json.loads(source_hotspot["platforms"])
+                    orjson.loads(source_hotspot["platforms"])
                     if isinstance(source_hotspot["platforms"], str)
                     else source_hotspot["platforms"]
                 )
@@ -926,7 +1343,7 @@ class HotspotService:
                     now,
                     now,
                     1,
-                    json.dumps(platforms),
+                    _json_dumps(platforms),
                     source_hotspot["status"],
                     source_hotspot["is_filtered"],
                     source_hotspot["filter_reason"],
@@ -1089,7 +1506,7 @@ class HotspotService:
                         platforms=[
                             PlatformInfo(**p)
                             for p in (
-                                json.loads(r["platforms"])
+                                orjson.loads(r["platforms"])
                                 if isinstance(r["platforms"], str)
                                 else r["platforms"]
                             )
@@ -1425,14 +1842,14 @@ class HotspotService:
                     id=r["id"],
                     keyword=r["keyword"],
                     cluster_id=r["cluster_id"],
-                    status=HotspotStatus(r["status"]),
+                    status=_STATUS_BY_VALUE[r["status"]],
                     last_seen_at=r["last_seen_at"],
                     last_crawled_at=r["last_crawled_at"],
                     crawl_count=r["crawl_count"],
                     platforms=[
                         PlatformInfo(**p)
                         for p in (
-                            json.loads(r["platforms"])
+                            orjson.loads(r["platforms"])
                             if isinstance(r["platforms"], str)
                             else r["platforms"]
                         )
@@ -1,6 +1,7 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import logging
-from app.db.session import pg_pool
+import asyncpg
+from app.db import session
 from app.schemas.push import (
     PushQueueItem,
     PushStatus,
@@ -8,6 +9,49 @@ from app.schemas.push import (
 
 logger = logging.getLogger(__name__)
 
+# 状态值到枚举的映射（比 PushStatus(value) 构造更快）
+_PUSH_STATUS_BY_VALUE = {s.value: s for s in PushStatus}
+
+# SQL 语句统一定义为模块常量，保证每次调用的语句文本完全一致，
+# 从而命中 asyncpg 的连接级预编译语句缓存（statement cache）
+# 插入推送队列；已存在时返回已有记录（依赖 hotspot_id 唯一约束和外键约束）
+_INSERT_PUSH_SQL = """
+    WITH inserted AS (
+        INSERT INTO push_queue (hotspot_id, status)
+        VALUES ($1, $2)
+        ON CONFLICT (hotspot_id) DO NOTHING
+        RETURNING id
+    )
+    SELECT id, TRUE as inserted FROM inserted
+    UNION ALL
+    SELECT id, FALSE as inserted FROM push_queue
+    WHERE hotspot_id = $1 AND NOT EXISTS (SELECT 1 FROM inserted)
+"""
+
+# 并发插入时 _INSERT_PUSH_SQL 可能看不到对方刚提交的行（语句快照），单独重新查询
+_SELECT_PUSH_ID_BY_HOTSPOT_SQL = "SELECT id FROM push_queue WHERE hotspot_id = $1"
+
+_SELECT_PENDING_PUSH_SQL = """
+    SELECT id, hotspot_id, status, created_at, updated_at
+    FROM push_queue
+    WHERE status = $1
+    ORDER BY created_at DESC
+    LIMIT $2
+"""
+
+_SELECT_PUSH_STATUS_SQL = "SELECT status FROM push_queue WHERE id = $1"
+
+_UPDATE_PUSH_STATUS_SQL = "UPDATE push_queue SET status = $1 WHERE id = $2"
+
+# 批量更新推送状态：一次往返，按数组逐项设置各自的新状态
+_UPDATE_PUSH_STATUSES_SQL = """
+    UPDATE push_queue AS pq
+    SET status = u.status
+    FROM UNNEST($1::bigint[], $2::text[]) AS u(id, status)
+    WHERE pq.id = u.id
+    RETURNING pq.id
+"""
+
 
 class PushService:
     """推送服务类 - 负责管理商业报告的推送队列"""
@@ -29,43 +73,32 @@ class PushService:
         异常:
             ValueError: 如果热点不存在
         """
-        async with pg_pool.acquire() as conn:
-            # 检查热点是否存在
-            hotspot = await conn.fetchrow(
-                """
-                SELECT id FROM hotspots WHERE id = $1
-                """,
-                hotspot_id,
-            )
-
-            if not hotspot:
+        async with session.pg_pool.acquire() as conn:
+            # 插入推送队列（一次往返：外键约束校验热点是否存在，唯一约束去重）
+            try:
+                row = await conn.fetchrow(
+                    _INSERT_PUSH_SQL, hotspot_id, PushStatus.PENDING.value
+                )
+            except asyncpg.ForeignKeyViolationError:
                 raise ValueError(f"Hotspot not found: hotspot_id={hotspot_id}")
 
-            # 检查是否已经在队列中
-            existing = await conn.fetchrow(
-                """
-                SELECT id FROM push_queue WHERE hotspot_id = $1
-                """,
-                hotspot_id,
-            )
-
-            if existing:
+            if row is None:
+                # 另一个并发请求在本语句执行期间插入了同一热点：ON CONFLICT 未插入，
+                # 而回退查询使用的语句快照看不到对方的行，新语句会使用新的快照
+                push_id = await conn.fetchval(_SELECT_PUSH_ID_BY_HOTSPOT_SQL, hotspot_id)
                 return {
                     "success": True,
-                    "push_id": existing["id"],
+                    "push_id": push_id,
                     "message": "Already in push queue",
                 }
 
-            # 插入推送队列
-            push_id = await conn.fetchval(
-                """
-                INSERT INTO push_queue (hotspot_id, status)
-                VALUES ($1, $2)
-                RETURNING id
-                """,
-                hotspot_id,
-                PushStatus.PENDING.value,
-            )
+            push_id = row["id"]
+            if not row["inserted"]:
+                return {
+                    "success": True,
+                    "push_id": push_id,
+                    "message": "Already in push queue",
+                }
 
             logger.info(
                 f"Added to push queue - push_id: {push_id}, hotspot_id: {hotspot_id}"
@@ -87,25 +120,18 @@ class PushService:
         返回:
             待推送项列表
         """
-        async with pg_pool.acquire() as conn:
+        async with session.pg_pool.acquire() as conn:
             # 获取待推送项
             rows = await conn.fetch(
-                """
-                SELECT id, hotspot_id, status, created_at, updated_at
-                FROM push_queue
-                WHERE status = $1
-                ORDER BY created_at DESC
-                LIMIT $2
-                """,
-                PushStatus.PENDING.value,
-                limit,
+                _SELECT_PENDING_PUSH_SQL, PushStatus.PENDING.value, limit
             )
 
+            # 数据来自数据库，字段类型可信，跳过 pydantic 校验
             items = [
-                PushQueueItem(
+                PushQueueItem.model_construct(
                     id=row["id"],
                     hotspot_id=row["hotspot_id"],
-                    status=PushStatus(row["status"]),
+                    status=_PUSH_STATUS_BY_VALUE[row["status"]],
                     created_at=row["created_at"],
                     updated_at=row["updated_at"],
                 )
@@ -129,30 +155,17 @@ class PushService:
         异常:
             ValueError: 如果推送项不存在
         """
-        async with pg_pool.acquire() as conn:
+        async with session.pg_pool.acquire() as conn:
             # 获取当前状态
-            current = await conn.fetchrow(
-                """
-                SELECT status FROM push_queue WHERE id = $1
-                """,
-                push_id,
-            )
+            current = await conn.fetchrow(_SELECT_PUSH_STATUS_SQL, push_id)
 
             if not current:
                 raise ValueError(f"Push item not found: push_id={push_id}")
 
-            old_status = PushStatus(current["status"])
+            old_status = _PUSH_STATUS_BY_VALUE[current["status"]]
 
             # 更新状态
-            await conn.execute(
-                """
-                UPDATE push_queue 
-                SET status = $1
-                WHERE id = $2
-                """,
-                status.value,
-                push_id,
-            )
+            await conn.execute(_UPDATE_PUSH_STATUS_SQL, status.value, push_id)
 
             logger.info(
                 f"Updated push status - push_id: {push_id}, "
@@ -166,6 +179,43 @@ class PushService:
                 "new_status": status,
             }
 
+    async def update_push_statuses(
+        self, items: List[Tuple[int, PushStatus]]
+    ) -> Dict[str, Any]:
+        """
+        批量更新推送状态
+
+        参数:
+            items: (推送队列项ID, 新的推送状态) 列表，同一ID出现多次时以最后一次为准
+
+        返回:
+            包含 success, updated_count, not_found_ids 的字典
+        """
+        statuses = dict(items)
+        if not statuses:
+            return {"success": True, "updated_count": 0, "not_found_ids": []}
+
+        async with session.pg_pool.acquire() as conn:
+            rows = await conn.fetch(
+                _UPDATE_PUSH_STATUSES_SQL,
+                list(statuses.keys()),
+                [status.value for status in statuses.values()],
+            )
+
+        updated_ids = {row["id"] for row in rows}
+        not_found_ids = [push_id for push_id in statuses if push_id not in updated_ids]
+
+        logger.info(
+            f"Batch updated push status - updated: {len(updated_ids)}, "
+            f"not_found: {not_found_ids}"
+        )
+
+        return {
+            "success": True,
+            "updated_count": len(updated_ids),
+            "not_found_ids": not_found_ids,
+        }
+
 
 # 全局单例
 push_service = PushService()
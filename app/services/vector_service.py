@@ -1,9 +1,75 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 from openai import AsyncOpenAI
 from app.config import settings
 from app.db import session
 
 
+# 半精度召回候选数 = top_k * RERANK_FACTOR，再用 float32 向量精确重排
+RERANK_FACTOR = 4
+
+
+def _build_search_vectors_sql(
+    has_collection: bool, has_threshold: bool, include_content: bool
+) -> str:
+    """
+    构建向量召回查询语句
+
+    使用内积运算符 <#> （负内积）
+    对于归一化向量（如 OpenAI embeddings），内积 = 余弦相似度
+    similarity = -(vector <#> query_vector) 将负内积转为正相似度 [0, 1]
+
+    先在 halfvec 列 vector_h 上走 HNSW 索引召回 top_k * RERANK_FACTOR 个候选，
+    再用 float32 的 vector 精确计算相似度、过滤阈值并重排；不需要 content 时不读取该列
+
+    参数顺序: $1 查询向量, $2 模型名称, [集合ID], [负相似度阈值], top_k
+    """
+    conditions = ["model_name = $2", "vector_h IS NOT NULL"]
+    param_idx = 3
+
+    if has_collection:
+        conditions.append(f"collection_id = ${param_idx}")
+        param_idx += 1
+
+    threshold_clause = ""
+    if has_threshold:
+        threshold_clause = f"WHERE (vector <#> $1) < ${param_idx}"
+        param_idx += 1
+
+    return f"""
+        WITH candidates AS (
+            SELECT id, collection_id, {"content" if include_content else "NULL::text AS content"},
+                   metadata, model_name, createtime, vector
+            FROM modeldata
+            WHERE {" AND ".join(conditions)}
+            ORDER BY vector_h <#> $1::vector::halfvec
+            LIMIT ${param_idx} * {RERANK_FACTOR}
+        )
+        SELECT
+            id,
+            collection_id,
+            content,
+            metadata,
+            model_name,
+            createtime,
+            (vector <#> $1) * -1 as similarity
+        FROM candidates
+        {threshold_clause}
+        ORDER BY vector <#> $1
+        LIMIT ${param_idx}
+    """
+
+
+# (是否按集合过滤, 是否有相似度阈值, 是否返回内容) -> 查询语句
+_SEARCH_VECTORS_SQL = {
+    (has_collection, has_threshold, include_content): _build_search_vectors_sql(
+        has_collection, has_threshold, include_content
+    )
+    for has_collection in (False, True)
+    for has_threshold in (False, True)
+    for include_content in (False, True)
+}
+
+
 class VectorService:
     """向量服务类 - 提供向量的添加、召回、删除功能"""
 
@@ -27,14 +93,33 @@ class VectorService:
         Returns:
             向量数组
         """
+        return (await self.generate_embeddings([text]))[0]
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        使用 OpenAI 批量生成文本向量（一次请求）
+
+        Args:
+            texts: 要生成向量的文本列表
+
+        Returns:
+            与 texts 顺序一致的向量数组列表
+
+        注意：OpenAI text-embedding-* 返回的向量已是单位长度，内积 <#> 即等价于
+        余弦相似度，因此这里不再归一化；更换为非单位长度的模型时需在入库前归一化
+        """
+        if not texts:
+            return []
+
         try:
             response = await self.openai_client.embeddings.create(
                 model=self.EMBEDDING_MODEL,
-                input=text,
+                input=texts,
             )
-            return response.data[0].embedding
+            # 按 index 排序，保证与输入顺序一致
+            return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
         except Exception as e:
-            raise Exception(f"Failed to generate embedding: {str(e)}")
+            raise Exception(f"Failed to generate embeddings: {str(e)}")
 
     async def add_vector(
         self,
@@ -72,6 +157,43 @@ class VectorService:
             )
             return record_id
 
+    async def add_vectors_bulk(
+        self,
+        items: List[Dict[str, Any]],
+    ) -> int:
+        """
+        批量添加向量（一次 embedding 请求 + 一次 COPY 写入）
+
+        Args:
+            items: 向量列表，每项包含 text, collection_id, metadata（可选）
+
+        Returns:
+            插入的向量数量
+        """
+        if not items:
+            return 0
+
+        # 批量生成向量
+        vectors = await self.generate_embeddings([item["text"] for item in items])
+
+        # 使用 COPY 协议批量写入数据库
+        async with session.pg_pool.acquire() as conn:
+            await conn.copy_records_to_table(
+                "modeldata",
+                columns=["vector", "collection_id", "content", "metadata", "model_name"],
+                records=[
+                    (
+                        vector,
+                        item["collection_id"],
+                        item["text"],
+                        item.get("metadata"),
+                        self.EMBEDDING_MODEL,
+                    )
+                    for item, vector in zip(items, vectors)
+                ],
+            )
+            return len(items)
+
     async def search_vectors(
         self,
         query_text: str,
@@ -79,6 +201,7 @@ class VectorService:
         top_k: int = 10,
         threshold: Optional[float] = None,
         ef_search: int = 100,
+        include_content: bool = True,
     ) -> List[Dict[str, Any]]:
         """
         向量召回（相似性搜索）
@@ -89,6 +212,7 @@ class VectorService:
             top_k: 返回最相似的前 k 个结果
             threshold: 可选的相似度阈值（0-1），只返回相似度大于此值的结果
             ef_search: HNSW 索引搜索参数，值越大搜索越精确但速度越慢，默认 100
+            include_content: 是否返回 content，为 False 时不读取该列（content 为 None）
 
         Returns:
             相似向量列表，包含 id, collection_id, metadata, similarity, createtime
@@ -99,52 +223,25 @@ class VectorService:
         # 确保 ef_search 至少为 1
         ef_search = max(ef_search, 1)
 
+        # 根据可选过滤条件选择固定的查询语句（保证语句文本稳定，可复用预编译语句缓存）
+        params = [query_vector, self.EMBEDDING_MODEL]
+        if collection_id:
+            params.append(collection_id)
+        if threshold is not None:
+            # vector <#> $1 < -threshold （因为 <#> 返回负内积）
+            params.append(-threshold)
+        params.append(top_k)
+        query = _SEARCH_VECTORS_SQL[
+            (bool(collection_id), threshold is not None, include_content)
+        ]
+
         async with session.pg_pool.acquire() as conn:
             # 在事务中执行所有操作
             async with conn.transaction():
-                # 设置 HNSW 搜索参数（在事务内部）
-                await conn.execute(f"SET LOCAL hnsw.ef_search = {ef_search}")
-
-                # 构建查询
-                # 使用内积运算符 <#> （负内积）
-                # 对于归一化向量（如 OpenAI embeddings），内积 = 余弦相似度
-                # similarity = -(vector <#> query_vector) 将负内积转为正相似度 [0, 1]
-                params = [query_vector]
-                param_idx = 2  # 从 $2 开始，$1 是 query_vector
-                conditions = []
-
-                # 只搜索相同模型的向量
-                conditions.append(f"model_name = ${param_idx}")
-                params.append(self.EMBEDDING_MODEL)
-                param_idx += 1
-
-                # 添加集合ID过滤
-                if collection_id:
-                    conditions.append(f"collection_id = ${param_idx}")
-                    params.append(collection_id)
-                    param_idx += 1
-
-                # 添加相似度阈值过滤
-                # vector <#> $1 < -threshold （因为 <#> 返回负内积）
-                if threshold is not None:
-                    conditions.append(f"(vector <#> $1) < -{threshold}")
-
-                # 构建完整查询
-                where_clause = " AND ".join(conditions) if conditions else "1=1"
-                query = f"""
-                    SELECT
-                        id,
-                        collection_id,
-                        content,
-                        metadata,
-                        model_name,
-                        createtime,
-                        (vector <#> $1) * -1 as similarity
-                    FROM modeldata
-                    WHERE {where_clause}
-                    ORDER BY similarity DESC
-                    LIMIT {top_k}
-                """
+                # 设置 HNSW 搜索参数（在事务内部，等价于 SET LOCAL）
+                await conn.execute(
+                    "SELECT set_config('hnsw.ef_search', $1, true)", str(ef_search)
+                )
 
                 # 执行查询
                 records = await conn.fetch(query, *params)
@@ -172,13 +269,11 @@ class VectorService:
             是否删除成功
         """
         async with session.pg_pool.acquire() as conn:
-            result = await conn.execute(
-                "DELETE FROM modeldata WHERE id = $1",
+            deleted = await conn.fetchval(
+                "DELETE FROM modeldata WHERE id = $1 RETURNING 1",
                 vector_id,
             )
-            # result 格式为 "DELETE n"，n 是删除的行数
-            deleted_count = int(result.split()[-1])
-            return deleted_count > 0
+            return deleted is not None
 
     async def delete_vectors_by_collection(self, collection_id: str) -> int:
         """
@@ -228,49 +323,128 @@ class VectorService:
                 }
             return None
 
+    async def iter_collections(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        逐个集合流式返回向量数据
+
+        使用服务端游标按 collection_id 顺序读取，内存中只保留当前集合
+
+        Yields:
+            集合信息，包含 collection_id、count 和 vectors（向量列表）
+        """
+        async with session.pg_pool.acquire() as conn:
+            # 游标必须在事务中使用
+            async with conn.transaction():
+                current_id = None
+                vectors: List[Dict[str, Any]] = []
+                async for record in conn.cursor(
+                    """
+                    SELECT id, collection_id, content, metadata, model_name, createtime
+                    FROM modeldata
+                    ORDER BY collection_id, createtime DESC
+                    """,
+                    prefetch=500,
+                ):
+                    collection_id = record["collection_id"]
+                    if collection_id != current_id:
+                        # 行已按 collection_id 排序，遇到新集合即可输出上一个集合
+                        if vectors:
+                            yield {
+                                "collection_id": current_id,
+                                "count": len(vectors),
+                                "vectors": vectors,
+                            }
+                        current_id = collection_id
+                        vectors = []
+
+                    vectors.append(
+                        {
+                            "id": record["id"],
+                            "content": record["content"],
+                            "metadata": record["metadata"],
+                            "model_name": record["model_name"],
+                            "createtime": (
+                                record["createtime"].isoformat()
+                                if record["createtime"]
+                                else None
+                            ),
+                        }
+                    )
+
+                if vectors:
+                    yield {
+                        "collection_id": current_id,
+                        "count": len(vectors),
+                        "vectors": vectors,
+                    }
+
     async def list_collections(self) -> List[Dict[str, Any]]:
         """
-        列出所有集合及其完整的向量数据
+        列出所有集合及其向量数量（不包含向量数据）
 
         Returns:
-            集合列表，每个集合包含 collection_id 和 vectors（向量列表）
+            集合列表，每个集合包含 collection_id、count 和 latest（最近写入时间）
         """
         async with session.pg_pool.acquire() as conn:
-            # 获取所有向量数据
             records = await conn.fetch(
                 """
-                SELECT id, collection_id, content, metadata, model_name, createtime
+                SELECT collection_id, COUNT(*) AS count, MAX(createtime) AS latest
                 FROM modeldata
-                ORDER BY collection_id, createtime DESC
+                GROUP BY collection_id
+                ORDER BY collection_id
                 """
             )
+            return [
+                {
+                    "collection_id": record["collection_id"],
+                    "count": record["count"],
+                    "latest": record["latest"].isoformat() if record["latest"] else None,
+                }
+                for record in records
+            ]
 
-            # 按 collection_id 分组
-            collections_dict: Dict[str, List[Dict[str, Any]]] = {}
-            for record in records:
-                collection_id = record["collection_id"]
-                if collection_id not in collections_dict:
-                    collections_dict[collection_id] = []
+    async def list_vectors(
+        self,
+        collection_id: str,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        分页列出指定集合的向量
 
-                collections_dict[collection_id].append(
-                    {
-                        "id": record["id"],
-                        "content": record["content"],
-                        "metadata": record["metadata"],
-                        "model_name": record["model_name"],
-                        "createtime": record["createtime"].isoformat(),
-                    }
-                )
+        Args:
+            collection_id: 集合ID
+            page: 页码，从1开始
+            page_size: 每页数量
 
-            # 转换为列表格式
+        Returns:
+            (向量列表, 总数)
+        """
+        async with session.pg_pool.acquire() as conn:
+            records = await conn.fetch(
+                """
+                SELECT COUNT(*) OVER() AS total_count,
+                       id, content, metadata, model_name, createtime
+                FROM modeldata
+                WHERE collection_id = $1
+                ORDER BY createtime DESC, id DESC
+                LIMIT $2 OFFSET $3
+                """,
+                collection_id,
+                page_size,
+                (page - 1) * page_size,
+            )
+            total = records[0]["total_count"] if records else 0
             return [
                 {
-                    "collection_id": collection_id,
-                    "count": len(vectors),
-                    "vectors": vectors,
+                    "id": record["id"],
+                    "content": record["content"],
+                    "metadata": record["metadata"],
+                    "model_name": record["model_name"],
+                    "createtime": record["createtime"].isoformat(),
                 }
-                for collection_id, vectors in collections_dict.items()
-            ]
+                for record in records
+            ], total
 
 
 # 全局向量服务实例
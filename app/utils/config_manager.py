@@ -3,14 +3,114 @@
 
 管理 IP 代理相关配置的读写和 Redis IP 池查询
 """
+import asyncio
+import copy
 import os
-import json
+import pickle
 import time
-from typing import List, Dict, Optional
-from dotenv import load_dotenv, set_key, find_dotenv
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
+from dotenv import load_dotenv, find_dotenv
+import orjson
 import redis.asyncio as redis
 
 
+@dataclass(slots=True)
+class IpInfo:
+    """IP 池中的单个代理 IP（slots 数据类，比逐条构建 dict 更省内存）"""
+    ip: str
+    port: int
+    protocol: str
+    user: Optional[str]
+    password: Optional[str]
+    expired_time_ts: int
+    is_valid: bool
+    ttl: int
+
+
+def _parse_ip_pool(
+    keys: List[bytes],
+    values: List[Optional[bytes]],
+    ttls: List[int],
+    current_time: int
+) -> List[IpInfo]:
+    """
+    解析 IP 池数据（纯 CPU 计算，可在线程池中执行）
+
+    Args:
+        keys: Redis key 列表
+        values: 与 keys 顺序一致的值列表
+        ttls: 与 keys 顺序一致的 TTL 列表
+        current_time: 当前时间戳
+
+    Returns:
+        List[IpInfo]: IP 信息列表
+    """
+    # 按 key 数量预分配列表，解析失败或值为空的条目最后统一截掉
+    ip_list: List[Optional[IpInfo]] = [None] * len(keys)
+    count = 0
+
+    # 循环内使用局部变量，减少属性查找
+    pickle_loads = pickle.loads
+    json_loads = orjson.loads
+    bytes_decode = bytes.decode
+
+    # 遍历每个 key 获取 IP 信息
+    for key, value, ttl in zip(keys, values, ttls):
+        try:
+            if not value:
+                continue
+
+            # 尝试反序列化 pickle 数据
+            try:
+                ip_data = pickle_loads(value)
+                # 如果 ip_data 是字符串，尝试解析为 JSON
+                if isinstance(ip_data, str):
+                    ip_data = json_loads(ip_data)
+            except (pickle.UnpicklingError, TypeError):
+                # 如果不是 pickle，尝试作为 JSON 解析
+                ip_data = json_loads(value)
+
+            # 从数据中直接获取 IP 和端口（优先使用数据中的值）
+            ip = ip_data.get("ip", "")
+            port = ip_data.get("port", 0)
+
+            # 如果数据中没有，则尝试从 key 中解析
+            # key 格式: {provider}_{ip}_{port}
+            # 直接在 bytes 上拆分（客户端未启用 decode_responses，key 总是 bytes），只解码 IP 部分
+            if not ip or not port:
+                parts = key.rsplit(b"_", 2)
+                if len(parts) == 3:
+                    ip = ip or bytes_decode(parts[1])
+                    port = port or int(parts[2])
+
+            # 从 protocol 字段中提取协议类型（去除 ://)
+            protocol = ip_data.get("protocol", "https://")
+            # 去除协议后缀 :// 只保留协议名称
+            protocol = protocol.replace("://", "").lower()
+
+            # 构建 IP 信息
+            expired_time_ts = ip_data.get("expired_time_ts", 0)
+            ip_list[count] = IpInfo(
+                ip,
+                int(port) if isinstance(port, str) else port,
+                protocol,
+                ip_data.get("user", ""),
+                ip_data.get("password", ""),
+                expired_time_ts,
+                expired_time_ts > current_time,
+                ttl if ttl > 0 else 0
+            )
+            count += 1
+
+        except (orjson.JSONDecodeError, KeyError, ValueError) as e:
+            print(f"解析 IP 数据失败 (key={bytes_decode(key, errors='replace')}): {str(e)}")
+            continue
+
+    del ip_list[count:]
+    return ip_list
+
+
 class ProxyConfigManager:
     """代理配置管理器"""
 
@@ -28,14 +128,124 @@ class ProxyConfigManager:
         "kdl_user_pwd": "KDL_USER_PWD",
     }
 
+    # 已解析的配置缓存：(.env 文件修改时间 st_mtime_ns, 配置字典)
+    _config_cache: Optional[Tuple[Optional[int], Dict[str, any]]] = None
+
+    # SCAN 每次迭代的建议返回数量
+    SCAN_COUNT = 1000
+
+    # 批量删除时每批的 key 数量
+    DELETE_BATCH_SIZE = 512
+
+    # 批量读取值和 TTL 时每个 pipeline 的 key 数量
+    FETCH_BATCH_SIZE = 500
+
+    # IP 数量超过该值时在线程池中解析
+    PARSE_IN_THREAD_THRESHOLD = 200
+
+    # Redis 客户端缓存，按 (host, port, password, db) 复用连接池
+    _redis_clients: Dict[Tuple[str, int, str, int], redis.Redis] = {}
+
+    @classmethod
+    def _get_redis_client(
+        cls,
+        redis_host: str,
+        redis_port: int,
+        redis_password: str,
+        redis_db: int
+    ) -> redis.Redis:
+        """
+        获取复用连接池的 Redis 客户端（不使用 decode_responses，因为数据是 pickle 序列化的）
+
+        Returns:
+            redis.Redis: Redis 客户端
+        """
+        key = (redis_host, redis_port, redis_password, redis_db)
+        client = cls._redis_clients.get(key)
+        if client is None:
+            client = redis.Redis(
+                connection_pool=redis.ConnectionPool(
+                    host=redis_host,
+                    port=redis_port,
+                    password=redis_password,
+                    db=redis_db,
+                    decode_responses=False  # 改为 False 以支持 pickle 二进制数据
+                )
+            )
+            cls._redis_clients[key] = client
+        return client
+
+    @classmethod
+    async def _scan_keys(cls, redis_client: redis.Redis, pattern: str) -> List[bytes]:
+        """
+        使用 SCAN 获取所有匹配的 key，避免 KEYS 阻塞 Redis
+
+        Args:
+            redis_client: Redis 客户端
+            pattern: key 匹配模式
+
+        Returns:
+            List[bytes]: 匹配的 key 列表
+        """
+        return [
+            key async for key in redis_client.scan_iter(match=pattern.encode(), count=cls.SCAN_COUNT)
+        ]
+
+    @classmethod
+    async def _fetch_values_and_ttls(
+        cls, redis_client: redis.Redis, keys: List[bytes]
+    ) -> Tuple[List[Optional[bytes]], List[int]]:
+        """
+        通过 pipeline 批量获取 key 的值和 TTL，每批一次往返
+
+        Args:
+            redis_client: Redis 客户端
+            keys: key 列表
+
+        Returns:
+            Tuple[List, List[int]]: 与 keys 顺序一致的值列表和 TTL 列表
+        """
+        values: List[Optional[bytes]] = []
+        ttls: List[int] = []
+        for i in range(0, len(keys), cls.FETCH_BATCH_SIZE):
+            chunk = keys[i:i + cls.FETCH_BATCH_SIZE]
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.mget(chunk)
+                for key in chunk:
+                    pipe.ttl(key)
+                results = await pipe.execute()
+            values.extend(results[0])
+            ttls.extend(results[1:])
+        return values, ttls
+
+    @classmethod
+    async def close_redis_clients(cls):
+        """关闭所有缓存的 Redis 连接池"""
+        clients = list(cls._redis_clients.values())
+        cls._redis_clients.clear()
+        for client in clients:
+            await client.connection_pool.disconnect()
+
     @classmethod
     def get_config(cls) -> Dict[str, any]:
         """
         获取当前代理配置
 
+        只有 .env 的修改时间变化时才重新执行 load_dotenv；在修改时间不可靠的
+        文件系统（如部分网络文件系统）上外部修改 .env 后，需调用 invalidate_cache()
+
         Returns:
             Dict: 代理配置字典
         """
+        # .env 未修改时直接返回缓存，不调用 load_dotenv，避免每次重新解析文件
+        try:
+            mtime = os.stat(cls.ENV_FILE).st_mtime_ns
+        except OSError:
+            mtime = None
+        if cls._config_cache and cls._config_cache[0] == mtime:
+            # 返回深拷贝，避免调用方修改缓存（包括嵌套的 kdl_config）
+            return copy.deepcopy(cls._config_cache[1])
+
         # 重新加载环境变量
         load_dotenv(override=True)
 
@@ -55,7 +265,18 @@ class ProxyConfigManager:
         if not any(config["kdl_config"].values()):
             config["kdl_config"] = None
 
-        return config
+        cls._config_cache = (mtime, config)
+        return copy.deepcopy(config)
+
+    @classmethod
+    def invalidate_cache(cls):
+        """清除配置缓存，下次 get_config 时重新加载 .env"""
+        cls._config_cache = None
+
+    @staticmethod
+    def _format_env_line(key: str, value: str) -> str:
+        """按 dotenv set_key 的默认格式（单引号包裹）生成一行配置"""
+        return "{}='{}'".format(key, value.replace("'", "\\'"))
 
     @classmethod
     def update_config(cls, **kwargs) -> bool:
@@ -69,25 +290,47 @@ class ProxyConfigManager:
             bool: 更新是否成功
         """
         try:
-            # 确保 .env 文件存在
-            if not os.path.exists(cls.ENV_FILE):
-                with open(cls.ENV_FILE, 'w') as f:
-                    f.write("# Trend API Server Configuration\n\n")
-
-            # 更新环境变量到文件
+            # 收集要写入的环境变量
+            updates: Dict[str, str] = {}
             for key, value in kwargs.items():
                 if key in cls.ENV_KEYS:
-                    env_key = cls.ENV_KEYS[key]
-
                     # 布尔值转换为字符串
                     if isinstance(value, bool):
                         value = "True" if value else "False"
+                    updates[cls.ENV_KEYS[key]] = str(value)
+
+            # 读取现有内容（不存在则新建）
+            if os.path.exists(cls.ENV_FILE):
+                with open(cls.ENV_FILE, 'r', encoding='utf-8') as f:
+                    lines = f.read().splitlines()
+            else:
+                lines = ["# Trend API Server Configuration", ""]
+
+            # 在内存中替换已有的键，保留注释和其他配置
+            written = set()
+            for i, line in enumerate(lines):
+                stripped = line.strip()
+                if stripped.startswith("export "):
+                    stripped = stripped[len("export "):].lstrip()
+                env_key = stripped.split("=", 1)[0].strip()
+                if "=" in stripped and env_key in updates:
+                    lines[i] = cls._format_env_line(env_key, updates[env_key])
+                    written.add(env_key)
+
+            # 追加不存在的键
+            lines.extend(
+                cls._format_env_line(k, v) for k, v in updates.items() if k not in written
+            )
 
-                    # 写入 .env 文件
-                    set_key(cls.ENV_FILE, env_key, str(value))
+            # 一次性写入临时文件后原子替换，避免多次重写和写入中途的不完整状态
+            tmp_file = f"{cls.ENV_FILE}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp_file, cls.ENV_FILE)
 
             # 重新加载环境变量
             load_dotenv(override=True)
+            cls.invalidate_cache()
 
             return True
         except Exception as e:
@@ -102,7 +345,7 @@ class ProxyConfigManager:
         redis_password: str = "123456",
         redis_db: int = 0,
         provider_pattern: str = "kuaidaili_*"
-    ) -> List[Dict[str, any]]:
+    ) -> List[IpInfo]:
         """
         从 Redis 中获取 IP 池列表
 
@@ -114,94 +357,29 @@ class ProxyConfigManager:
             provider_pattern: IP 提供商 key 匹配模式
 
         Returns:
-            List[Dict]: IP 信息列表
+            List[IpInfo]: IP 信息列表（需要 dict 时在 API 层用 dataclasses.asdict 转换）
         """
-        ip_list = []
-        redis_client = None
-
         try:
-            # 连接 Redis (不使用 decode_responses，因为数据是 pickle 序列化的)
-            redis_client = redis.Redis(
-                host=redis_host,
-                port=redis_port,
-                password=redis_password,
-                db=redis_db,
-                decode_responses=False  # 改为 False 以支持 pickle 二进制数据
-            )
+            redis_client = cls._get_redis_client(redis_host, redis_port, redis_password, redis_db)
 
             # 获取所有匹配的 key
-            keys = await redis_client.keys(provider_pattern.encode())
+            keys = await cls._scan_keys(redis_client, provider_pattern)
+            if not keys:
+                return []
+
+            # 通过 pipeline 批量获取值 (MGET) 和 TTL
+            values, ttls = await cls._fetch_values_and_ttls(redis_client, keys)
 
             current_time = int(time.time())
 
-            # 遍历每个 key 获取 IP 信息
-            for key in keys:
-                try:
-                    # 解码 key
-                    key_str = key.decode() if isinstance(key, bytes) else key
-
-                    # 获取 key 的值
-                    value = await redis_client.get(key)
-                    if not value:
-                        continue
-
-                    # 尝试反序列化 pickle 数据
-                    import pickle
-                    try:
-                        ip_data = pickle.loads(value)
-                        # 如果 ip_data 是字符串，尝试解析为 JSON
-                        if isinstance(ip_data, str):
-                            ip_data = json.loads(ip_data)
-                    except (pickle.UnpicklingError, TypeError):
-                        # 如果不是 pickle，尝试作为 JSON 解析
-                        ip_data = json.loads(value.decode() if isinstance(value, bytes) else value)
-
-                    # 从数据中直接获取 IP 和端口（优先使用数据中的值）
-                    ip = ip_data.get("ip", "")
-                    port = ip_data.get("port", 0)
-
-                    # 如果数据中没有，则尝试从 key 中解析
-                    # key 格式: {provider}_{ip}_{port}
-                    if not ip or not port:
-                        parts = key_str.split("_")
-                        if len(parts) >= 3:
-                            ip = ip or parts[-2]
-                            port = port or int(parts[-1])
-
-                    # 从 protocol 字段中提取协议类型（去除 ://)
-                    protocol = ip_data.get("protocol", "https://")
-                    # 去除协议后缀 :// 只保留协议名称
-                    protocol = protocol.replace("://", "").lower()
-
-                    # 获取 TTL
-                    ttl = await redis_client.ttl(key)
-
-                    # 构建 IP 信息
-                    ip_info = {
-                        "ip": ip,
-                        "port": int(port) if isinstance(port, str) else port,
-                        "protocol": protocol,
-                        "user": ip_data.get("user", ""),
-                        "password": ip_data.get("password", ""),
-                        "expired_time_ts": ip_data.get("expired_time_ts", 0),
-                        "is_valid": ip_data.get("expired_time_ts", 0) > current_time,
-                        "ttl": ttl if ttl > 0 else 0
-                    }
-
-                    ip_list.append(ip_info)
-
-                except (json.JSONDecodeError, KeyError, ValueError) as e:
-                    print(f"解析 IP 数据失败 (key={key_str}): {str(e)}")
-                    continue
-
-            return ip_list
+            # IP 较多时在线程池中解析，避免阻塞事件循环
+            if len(keys) > cls.PARSE_IN_THREAD_THRESHOLD:
+                return await asyncio.to_thread(_parse_ip_pool, keys, values, ttls, current_time)
+            return _parse_ip_pool(keys, values, ttls, current_time)
 
         except Exception as e:
             print(f"从 Redis 获取 IP 池失败: {str(e)}")
             return []
-        finally:
-            if redis_client:
-                await redis_client.close()
 
     @classmethod
     async def clear_ip_pool(
@@ -225,32 +403,23 @@ class ProxyConfigManager:
         Returns:
             int: 删除的 IP 数量
         """
-        redis_client = None
-
         try:
-            # 连接 Redis (不使用 decode_responses)
-            redis_client = redis.Redis(
-                host=redis_host,
-                port=redis_port,
-                password=redis_password,
-                db=redis_db,
-                decode_responses=False
-            )
+            redis_client = cls._get_redis_client(redis_host, redis_port, redis_password, redis_db)
 
             # 获取所有匹配的 key
-            keys = await redis_client.keys(provider_pattern.encode())
+            keys = await cls._scan_keys(redis_client, provider_pattern)
 
             if not keys:
                 return 0
 
-            # 删除所有匹配的 key
-            deleted_count = await redis_client.delete(*keys)
+            # 分批删除所有匹配的 key，一次往返提交所有批次
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for i in range(0, len(keys), cls.DELETE_BATCH_SIZE):
+                    pipe.delete(*keys[i:i + cls.DELETE_BATCH_SIZE])
+                results = await pipe.execute()
 
-            return deleted_count
+            return sum(results)
 
         except Exception as e:
             print(f"清空 IP 池失败: {str(e)}")
             return 0
-        finally:
-            if redis_client:
-                await redis_client.close()
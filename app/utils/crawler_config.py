@@ -5,19 +5,18 @@ MediaCrawlerPro-Python 配置转换工具
 实现配置的统一管理，无需修改 MediaCrawlerPro-Python 项目代码。
 """
 
+from functools import lru_cache
 from typing import Dict
 from app.config import settings
 
 
-def get_crawler_env_config() -> Dict[str, str]:
+@lru_cache(maxsize=1)
+def _build_crawler_env_config() -> Dict[str, str]:
     """
-    将 API 服务的配置转换为 MediaCrawlerPro-Python 需要的环境变量字典
-
-    MediaCrawlerPro-Python 使用 os.getenv() 读取配置，
-    我们通过设置环境变量的方式，让它使用我们 API 服务的配置。
+    构建默认环境变量字典（settings 运行期间不变，只构建一次）
 
     Returns:
-        Dict[str, str]: 环境变量字典
+        Dict[str, str]: 环境变量字典（共享缓存，调用方不可修改）
     """
     env_config = {
         # 数据库配置 (db_config.py)
@@ -76,6 +75,66 @@ def get_crawler_env_config() -> Dict[str, str]:
     return env_config
 
 
+def get_crawler_env_config() -> Dict[str, str]:
+    """
+    将 API 服务的配置转换为 MediaCrawlerPro-Python 需要的环境变量字典
+
+    MediaCrawlerPro-Python 使用 os.getenv() 读取配置，
+    我们通过设置环境变量的方式，让它使用我们 API 服务的配置。
+
+    Returns:
+        Dict[str, str]: 环境变量字典（缓存的副本，可自由修改）
+    """
+    return dict(_build_crawler_env_config())
+
+
+def invalidate_env_cache():
+    """清除默认环境变量缓存（settings 热更新后调用）"""
+    _build_crawler_env_config.cache_clear()
+
+
+# 参数映射表：(任务参数名, 环境变量名)
+_PARAM_MAPPING = (
+    ("platform", "PLATFORM"),
+    ("keywords", "KEYWORDS"),
+    ("crawler_type", "CRAWLER_TYPE"),
+    ("sort_type", "SORT_TYPE"),
+    ("publish_time_type", "PUBLISH_TIME_TYPE"),
+    ("save_data_option", "SAVE_DATA_OPTION"),
+    ("start_page", "START_PAGE"),
+    ("max_notes_count", "CRAWLER_MAX_NOTES_COUNT"),
+    ("max_comments_count", "PER_NOTE_MAX_COMMENTS_COUNT"),
+    ("max_notes", "CRAWLER_MAX_NOTES_COUNT"),
+    ("max_concurrency", "MAX_CONCURRENCY_NUM"),
+    ("time_sleep", "CRAWLER_TIME_SLEEP"),
+    ("enable_comments", "ENABLE_GET_COMMENTS"),
+    ("enable_sub_comments", "ENABLE_GET_SUB_COMMENTS"),
+    ("max_comments_per_note", "PER_NOTE_MAX_COMMENTS_COUNT"),
+    ("enable_checkpoint", "ENABLE_CHECKPOINT"),
+    ("checkpoint_id", "SPECIFIED_CHECKPOINT_ID"),
+    ("hotspot_id", "HOTSPOT_ID"),  # 热点ID参数映射
+)
+
+# 列表参数表：(任务参数名, 环境变量名, 分隔符)
+_LIST_PARAMS = (
+    ("xhs_note_url_list", "XHS_SPECIFIED_NOTE_URL_LIST", "||"),  # 小红书笔记URL列表
+    ("xhs_creator_url_list", "XHS_CREATOR_URL_LIST", "||"),  # 小红书创作者URL列表
+    ("weibo_specified_id_list", "WEIBO_SPECIFIED_ID_LIST", ","),  # 微博指定ID列表
+    ("weibo_creator_id_list", "WEIBO_CREATOR_ID_LIST", ","),  # 微博创作者ID列表
+    ("tieba_specified_id_list", "TIEBA_SPECIFIED_ID_LIST", ","),  # 贴吧指定ID列表
+    ("tieba_name_list", "TIEBA_NAME_LIST", ","),  # 贴吧名称列表
+    ("tieba_creator_url_list", "TIEBA_CREATOR_URL_LIST", "||"),  # 贴吧创作者URL列表
+    ("bili_creator_id_list", "BILI_CREATOR_ID_LIST", ","),  # B站创作者ID列表
+    ("bili_specified_id_list", "BILI_SPECIFIED_ID_LIST", ","),  # B站视频ID列表
+    ("dy_specified_id_list", "DY_SPECIFIED_ID_LIST", ","),  # 抖音指定ID列表
+    ("dy_creator_id_list", "DY_CREATOR_ID_LIST", ","),  # 抖音创作者ID列表
+    ("ks_specified_id_list", "KS_SPECIFIED_ID_LIST", ","),  # 快手指定ID列表
+    ("ks_creator_id_list", "KS_CREATOR_ID_LIST", ","),  # 快手创作者ID列表
+    ("zhihu_creator_url_list", "ZHIHU_CREATOR_URL_LIST", "||"),  # 知乎创作者URL列表
+    ("zhihu_specified_id_list", "ZHIHU_SPECIFIED_ID_LIST", "||"),  # 知乎指定ID列表
+)
+
+
 def merge_task_config(task_params: Dict) -> Dict[str, str]:
     """
     合并任务参数到环境变量配置中
@@ -98,133 +157,15 @@ def merge_task_config(task_params: Dict) -> Dict[str, str]:
     # 先获取默认配置
     env_config = get_crawler_env_config()
 
-    # 参数映射表：任务参数名 -> 环境变量名
-    param_mapping = {
-        "platform": "PLATFORM",
-        "keywords": "KEYWORDS",
-        "crawler_type": "CRAWLER_TYPE",
-        "sort_type": "SORT_TYPE",
-        "publish_time_type": "PUBLISH_TIME_TYPE",
-        "save_data_option": "SAVE_DATA_OPTION",
-        "start_page": "START_PAGE",
-        "max_notes_count": "CRAWLER_MAX_NOTES_COUNT",
-        "max_comments_count": "PER_NOTE_MAX_COMMENTS_COUNT",
-        "max_notes": "CRAWLER_MAX_NOTES_COUNT",
-        "max_concurrency": "MAX_CONCURRENCY_NUM",
-        "time_sleep": "CRAWLER_TIME_SLEEP",
-        "enable_comments": "ENABLE_GET_COMMENTS",
-        "enable_sub_comments": "ENABLE_GET_SUB_COMMENTS",
-        "max_comments_per_note": "PER_NOTE_MAX_COMMENTS_COUNT",
-        "enable_checkpoint": "ENABLE_CHECKPOINT",
-        "checkpoint_id": "SPECIFIED_CHECKPOINT_ID",
-        "hotspot_id": "HOTSPOT_ID",  # 热点ID参数映射
-    }
-
     # 将任务参数映射到环境变量
-    for task_key, env_key in param_mapping.items():
+    for task_key, env_key in _PARAM_MAPPING:
         if task_key in task_params:
             env_config[env_key] = str(task_params[task_key])
 
-    # 小红书笔记URL列表
-    if "xhs_note_url_list" in task_params and task_params["xhs_note_url_list"]:
-        env_config["XHS_SPECIFIED_NOTE_URL_LIST"] = "||".join(
-            task_params["xhs_note_url_list"]
-        )
-
-    # 小红书创作者URL列表
-    if "xhs_creator_url_list" in task_params and task_params["xhs_creator_url_list"]:
-        env_config["XHS_CREATOR_URL_LIST"] = "||".join(
-            task_params["xhs_creator_url_list"]
-        )
-
-    # 微博指定ID列表
-    if (
-        "weibo_specified_id_list" in task_params
-        and task_params["weibo_specified_id_list"]
-    ):
-        env_config["WEIBO_SPECIFIED_ID_LIST"] = ",".join(
-            task_params["weibo_specified_id_list"]
-        )
-
-    # 微博创作者ID列表
-    if "weibo_creator_id_list" in task_params and task_params["weibo_creator_id_list"]:
-        env_config["WEIBO_CREATOR_ID_LIST"] = ",".join(
-            task_params["weibo_creator_id_list"]
-        )
-
-    # 贴吧指定ID列表
-    if (
-        "tieba_specified_id_list" in task_params
-        and task_params["tieba_specified_id_list"]
-    ):
-        env_config["TIEBA_SPECIFIED_ID_LIST"] = ",".join(
-            task_params["tieba_specified_id_list"]
-        )
-
-    # 贴吧名称列表
-    if "tieba_name_list" in task_params and task_params["tieba_name_list"]:
-        env_config["TIEBA_NAME_LIST"] = ",".join(task_params["tieba_name_list"])
-
-    # 贴吧创作者URL列表
-    if (
-        "tieba_creator_url_list" in task_params
-        and task_params["tieba_creator_url_list"]
-    ):
-        env_config["TIEBA_CREATOR_URL_LIST"] = "||".join(
-            task_params["tieba_creator_url_list"]
-        )
-
-    # B站创作者ID列表
-    if "bili_creator_id_list" in task_params and task_params["bili_creator_id_list"]:
-        env_config["BILI_CREATOR_ID_LIST"] = ",".join(
-            task_params["bili_creator_id_list"]
-        )
-
-    # B站视频ID列表
-    if (
-        "bili_specified_id_list" in task_params
-        and task_params["bili_specified_id_list"]
-    ):
-        env_config["BILI_SPECIFIED_ID_LIST"] = ",".join(
-            task_params["bili_specified_id_list"]
-        )
-
-    # 抖音指定ID列表
-    if "dy_specified_id_list" in task_params and task_params["dy_specified_id_list"]:
-        env_config["DY_SPECIFIED_ID_LIST"] = ",".join(
-            task_params["dy_specified_id_list"]
-        )
-
-    # 抖音创作者ID列表
-    if "dy_creator_id_list" in task_params and task_params["dy_creator_id_list"]:
-        env_config["DY_CREATOR_ID_LIST"] = ",".join(task_params["dy_creator_id_list"])
-
-    # 快手指定ID列表
-    if "ks_specified_id_list" in task_params and task_params["ks_specified_id_list"]:
-        env_config["KS_SPECIFIED_ID_LIST"] = ",".join(
-            task_params["ks_specified_id_list"]
-        )
-
-    # 快手创作者ID列表
-    if "ks_creator_id_list" in task_params and task_params["ks_creator_id_list"]:
-        env_config["KS_CREATOR_ID_LIST"] = ",".join(task_params["ks_creator_id_list"])
-
-    # 知乎创作者URL列表
-    if (
-        "zhihu_creator_url_list" in task_params
-        and task_params["zhihu_creator_url_list"]
-    ):
-        env_config["ZHIHU_CREATOR_URL_LIST"] = "||".join(
-            task_params["zhihu_creator_url_list"]
-        )
-
-    # 知乎指定ID列表
-    if (
-        "zhihu_specified_id_list" in task_params
-        and task_params["zhihu_specified_id_list"]
-    ):
-        env_config["ZHIHU_SPECIFIED_ID_LIST"] = "||".join(
-            task_params["zhihu_specified_id_list"]
-        )
+    # 列表参数拼接为分隔符连接的字符串
+    for task_key, env_key, separator in _LIST_PARAMS:
+        values = task_params.get(task_key)
+        if values:
+            env_config[env_key] = separator.join(values)
 
     return env_config
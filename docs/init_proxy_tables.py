@@ -8,6 +8,7 @@ import asyncio
 import asyncpg
 import sys
 import os
+from pathlib import Path
 
 # 添加项目根目录到 Python 路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,6 +16,64 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.config import settings
 
 
+def split_sql_statements(sql: str) -> list:
+    """
+    将 SQL 脚本拆分为单条语句
+
+    按分号拆分，跳过 -- 注释、单引号字符串和 $$ 包裹的函数体中的分号
+    """
+    statements = []
+    current = []
+    i = 0
+    length = len(sql)
+    in_string = False
+    dollar_tag = None
+
+    while i < length:
+        ch = sql[i]
+
+        if dollar_tag:
+            # 函数体内，直到遇到相同的结束标记
+            if sql.startswith(dollar_tag, i):
+                current.append(dollar_tag)
+                i += len(dollar_tag)
+                dollar_tag = None
+                continue
+        elif in_string:
+            if ch == "'":
+                in_string = False
+        elif ch == "'":
+            in_string = True
+        elif ch == "-" and sql.startswith("--", i):
+            # 跳过行注释
+            end = sql.find("\n", i)
+            i = length if end == -1 else end
+            continue
+        elif ch == "$":
+            end = sql.find("$", i + 1)
+            tag = sql[i:end + 1] if end != -1 else ""
+            if tag and (tag == "$$" or tag[1:-1].isidentifier()):
+                current.append(tag)
+                i += len(tag)
+                dollar_tag = tag
+                continue
+        elif ch == ";":
+            statement = "".join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+            i += 1
+            continue
+
+        current.append(ch)
+        i += 1
+
+    statement = "".join(current).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+
 async def init_proxy_tables():
     """初始化代理池表结构"""
     print("=" * 60)
@@ -50,8 +109,7 @@ async def init_proxy_tables():
     print(f"\n正在读取 SQL 文件: {sql_file}")
     
     try:
-        with open(sql_file, 'r', encoding='utf-8') as f:
-            sql_content = f.read()
+        sql_content = Path(sql_file).read_text(encoding='utf-8')
         print("✓ SQL 文件读取成功")
     except FileNotFoundError:
         print(f"✗ SQL 文件不存在: {sql_file}")
@@ -66,11 +124,18 @@ async def init_proxy_tables():
     print("\n正在创建表结构...")
     
     try:
-        # 分割并执行 SQL 语句
-        # 注意：PostgreSQL 的 COMMENT 和 CREATE TABLE 需要分开执行
-        await conn.execute(sql_content)
-        print("✓ 表结构创建成功")
-        
+        # 拆分为单条语句，在同一事务中逐条执行：任一语句失败则整体回滚，并能定位出错语句
+        statements = split_sql_statements(sql_content)
+        async with conn.transaction():
+            for index, statement in enumerate(statements, 1):
+                try:
+                    await conn.execute(statement)
+                except Exception:
+                    print(f"✗ 第 {index}/{len(statements)} 条语句执行失败:")
+                    print(f"  {statement.splitlines()[0]}")
+                    raise
+        print(f"✓ 表结构创建成功（共 {len(statements)} 条语句）")
+
         # 验证表是否创建成功
         print("\n验证表结构...")
         tables = await conn.fetch("""
@@ -0,0 +1,46 @@
+-- 数据库迁移脚本：为 hotspots 添加半精度向量列 embedding_h
+-- 日期：2026-10-16
+-- 描述：相似度召回改为在 halfvec 列上走 HNSW 索引（读取字节数减半），
+--       召回的候选再用 float32 的 embedding 精确重排。
+--       需要 pgvector >= 0.7.0（halfvec 类型）
+--       HNSW 索引要求列声明维度，1536 需与已存储的向量维度一致
+--       （可用 SELECT vector_dims(embedding) FROM hotspots LIMIT 1 确认；halfvec 的 HNSW 索引最多支持 4000 维）
+
+-- PostgreSQL 迁移脚本
+
+-- 1. 添加半精度向量列
+ALTER TABLE hotspots
+ADD COLUMN IF NOT EXISTS embedding_h halfvec(1536);
+
+-- 已按旧版本脚本创建了未声明维度的列时，补上维度
+ALTER TABLE hotspots
+ALTER COLUMN embedding_h TYPE halfvec(1536) USING embedding_h::halfvec(1536);
+
+-- 2. 回填已有数据
+UPDATE hotspots
+SET embedding_h = embedding::halfvec(1536)
+WHERE embedding IS NOT NULL AND embedding_h IS NULL;
+
+-- 3. 触发器：写入或更新 embedding 时自动同步 embedding_h
+CREATE OR REPLACE FUNCTION sync_hotspot_embedding_h()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.embedding_h = NEW.embedding::halfvec(1536);
+    RETURN NEW;
+END;
+$$ LANGUAGE 'plpgsql';
+
+DROP TRIGGER IF EXISTS sync_hotspots_embedding_h ON hotspots;
+CREATE TRIGGER sync_hotspots_embedding_h BEFORE INSERT OR UPDATE OF embedding ON hotspots
+    FOR EACH ROW EXECUTE FUNCTION sync_hotspot_embedding_h();
+
+-- 4. 创建半精度向量索引
+CREATE INDEX IF NOT EXISTS idx_hotspots_embedding_h ON hotspots
+USING hnsw (embedding_h halfvec_ip_ops)
+WITH (m = 16, ef_construction = 64);
+
+-- 5. 添加字段注释
+COMMENT ON COLUMN hotspots.embedding_h IS 'embedding 的 halfvec 副本（用于 HNSW 候选召回）';
+
+-- 验证迁移
+-- SELECT COUNT(*) FROM hotspots WHERE embedding IS NOT NULL AND embedding_h IS NULL;
@@ -0,0 +1,17 @@
+-- 数据库迁移脚本：确保 hotspots.embedding 上存在 HNSW 内积索引
+-- 日期：2026-10-16
+-- 描述：热词相似度查询改为 ORDER BY embedding <#> $1 LIMIT k，
+--       需要 vector_ip_ops 的 HNSW 索引才能走索引扫描（旧库可能缺失该索引）
+
+-- PostgreSQL 迁移脚本
+
+-- 1. 创建向量相似度索引
+CREATE INDEX IF NOT EXISTS idx_hotspots_embedding ON hotspots
+USING hnsw (embedding vector_ip_ops)
+WITH (m = 16, ef_construction = 64);
+
+-- 验证迁移
+-- EXPLAIN SELECT id FROM hotspots
+-- WHERE embedding IS NOT NULL
+-- ORDER BY embedding <#> '[...]'::vector
+-- LIMIT 5;
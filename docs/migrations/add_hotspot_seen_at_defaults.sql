@@ -0,0 +1,17 @@
+-- 数据库迁移脚本：为 hotspots 的时间追踪字段添加默认值
+-- 日期：2026-10-16
+-- 描述：first_seen_at / last_seen_at 改由数据库写入 CURRENT_TIMESTAMP，
+--       应用层插入热点时不再传递这两个时间参数
+
+-- PostgreSQL 迁移脚本
+
+-- 1. 添加默认值
+ALTER TABLE hotspots
+ALTER COLUMN first_seen_at SET DEFAULT CURRENT_TIMESTAMP;
+
+ALTER TABLE hotspots
+ALTER COLUMN last_seen_at SET DEFAULT CURRENT_TIMESTAMP;
+
+-- 验证迁移
+-- 查看表结构
+-- \d hotspots
@@ -0,0 +1,46 @@
+-- 数据库迁移脚本：为 modeldata 添加半精度向量列 vector_h
+-- 日期：2026-10-16
+-- 描述：向量召回改为在 halfvec 列上走 HNSW 索引（读取字节数减半），
+--       召回 top_k * 4 个候选后再用 float32 的 vector 精确重排。
+--       需要 pgvector >= 0.7.0（halfvec 类型）
+--       HNSW 索引要求列声明维度，1536 需与已存储的向量维度一致
+--       （可用 SELECT vector_dims(vector) FROM modeldata LIMIT 1 确认；halfvec 的 HNSW 索引最多支持 4000 维）
+
+-- PostgreSQL 迁移脚本
+
+-- 1. 添加半精度向量列
+ALTER TABLE modeldata
+ADD COLUMN IF NOT EXISTS vector_h halfvec(1536);
+
+-- 已按旧版本脚本创建了未声明维度的列时，补上维度
+ALTER TABLE modeldata
+ALTER COLUMN vector_h TYPE halfvec(1536) USING vector_h::halfvec(1536);
+
+-- 2. 回填已有数据
+UPDATE modeldata
+SET vector_h = vector::halfvec(1536)
+WHERE vector IS NOT NULL AND vector_h IS NULL;
+
+-- 3. 触发器：写入或更新 vector 时自动同步 vector_h
+CREATE OR REPLACE FUNCTION sync_modeldata_vector_h()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.vector_h = NEW.vector::halfvec(1536);
+    RETURN NEW;
+END;
+$$ LANGUAGE 'plpgsql';
+
+DROP TRIGGER IF EXISTS sync_modeldata_vector_h ON modeldata;
+CREATE TRIGGER sync_modeldata_vector_h BEFORE INSERT OR UPDATE OF vector ON modeldata
+    FOR EACH ROW EXECUTE FUNCTION sync_modeldata_vector_h();
+
+-- 4. 创建半精度向量索引
+CREATE INDEX IF NOT EXISTS idx_modeldata_vector_h ON modeldata
+USING hnsw (vector_h halfvec_ip_ops)
+WITH (m = 16, ef_construction = 64);
+
+-- 5. 添加字段注释
+COMMENT ON COLUMN modeldata.vector_h IS 'vector 的 halfvec 副本（用于 HNSW 候选召回）';
+
+-- 验证迁移
+-- SELECT COUNT(*) FROM modeldata WHERE vector IS NOT NULL AND vector_h IS NULL;
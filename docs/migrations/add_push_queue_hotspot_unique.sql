@@ -0,0 +1,22 @@
+-- 数据库迁移脚本：push_queue.hotspot_id 改为唯一索引
+-- 日期：2026-10-16
+-- 描述：PushService.add_to_push_queue 改为单条
+--       INSERT ... ON CONFLICT (hotspot_id) DO NOTHING，
+--       需要 hotspot_id 上的唯一约束；热点是否存在由外键 fk_push_queue_hotspot 校验
+
+-- PostgreSQL 迁移脚本
+
+-- 0. 检查是否存在重复数据（有结果时需先清理，否则唯一索引创建失败）
+-- SELECT hotspot_id, COUNT(*) FROM push_queue GROUP BY hotspot_id HAVING COUNT(*) > 1;
+-- 保留每个热点最早的一条：
+-- DELETE FROM push_queue a USING push_queue b
+-- WHERE a.hotspot_id = b.hotspot_id AND a.id > b.id;
+
+-- 1. 创建唯一索引
+CREATE UNIQUE INDEX IF NOT EXISTS uk_push_queue_hotspot_id ON push_queue (hotspot_id);
+
+-- 2. 删除被唯一索引取代的普通索引
+DROP INDEX IF EXISTS idx_push_queue_hotspot_id;
+
+-- 3. 确认外键存在（热点不存在时插入会失败）
+-- SELECT conname FROM pg_constraint WHERE conname = 'fk_push_queue_hotspot';
@@ -0,0 +1,24 @@
+-- 数据库迁移脚本：待推送部分索引改为覆盖索引
+-- 日期：2026-10-16
+-- 描述：PushService.get_pending_push_items 只读取
+--       id, hotspot_id, status, created_at, updated_at 五列，
+--       将这些列 INCLUDE 进 idx_push_queue_pending_created_at 后，
+--       查询可走 Index Only Scan，无需回表读取 push_queue 堆页面
+
+-- PostgreSQL 迁移脚本
+
+-- 1. 重建待推送部分索引（带 INCLUDE 列）
+DROP INDEX IF EXISTS idx_push_queue_pending_created_at;
+
+CREATE INDEX idx_push_queue_pending_created_at
+ON push_queue (created_at DESC)
+INCLUDE (id, hotspot_id, status, updated_at)
+WHERE status = 'pending';
+
+-- 验证迁移（应显示 Index Only Scan using idx_push_queue_pending_created_at）
+-- VACUUM ANALYZE push_queue;
+-- EXPLAIN SELECT id, hotspot_id, status, created_at, updated_at
+-- FROM push_queue
+-- WHERE status = 'pending'
+-- ORDER BY created_at DESC
+-- LIMIT 10;
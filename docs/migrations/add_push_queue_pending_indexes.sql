@@ -0,0 +1,27 @@
+-- 数据库迁移脚本：为推送队列查询添加匹配的索引
+-- 日期：2026-10-16
+-- 描述：
+--   1. PushService.get_pending_push_items 查询
+--      WHERE status = 'pending' ORDER BY created_at DESC LIMIT n
+--      使用部分索引后只需读取前 n 个索引项，无需扫描并排序
+--   2. 推送间隔判断 SELECT MAX(sent_at) FROM push_queue WHERE status = 'sent'
+--      使用 (status, sent_at DESC) 索引直接取首项
+--   （hotspot_id 去重查询已有 idx_push_queue_hotspot_id）
+
+-- PostgreSQL 迁移脚本
+
+-- 1. 待推送部分索引（与查询的 ORDER BY 一致）
+CREATE INDEX IF NOT EXISTS idx_push_queue_pending_created_at
+ON push_queue (created_at DESC)
+WHERE status = 'pending';
+
+-- 2. 最近发送时间索引
+CREATE INDEX IF NOT EXISTS idx_push_queue_status_sent_at
+ON push_queue (status, sent_at DESC);
+
+-- 验证迁移
+-- EXPLAIN SELECT id, hotspot_id, status, created_at, updated_at
+-- FROM push_queue
+-- WHERE status = 'pending'
+-- ORDER BY created_at DESC
+-- LIMIT 10;
@@ -0,0 +1,27 @@
+-- 数据库迁移脚本：为 push_queue 添加整型优先级排序列
+-- 日期：2026-10-16
+-- 描述：待推送查询原先按 CASE priority WHEN ... END 排序，无法使用索引。
+--       新增生成列 priority_rank（high=1, medium=2, low=3）及 pending 部分索引，
+--       排序改为 ORDER BY priority_rank, score DESC
+
+-- PostgreSQL 迁移脚本
+
+-- 1. 添加生成列（由 priority 自动计算，写入方无需改动）
+ALTER TABLE push_queue
+ADD COLUMN IF NOT EXISTS priority_rank SMALLINT GENERATED ALWAYS AS (
+    CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END
+) STORED;
+
+-- 2. 创建待推送部分索引
+CREATE INDEX IF NOT EXISTS idx_push_queue_pending_rank
+ON push_queue (priority_rank, score DESC)
+WHERE status = 'pending';
+
+-- 3. 添加字段注释
+COMMENT ON COLUMN push_queue.priority_rank IS '优先级排序值（high=1, medium=2, low=3）';
+
+-- 验证迁移
+-- EXPLAIN SELECT * FROM push_queue
+-- WHERE status = 'pending'
+-- ORDER BY priority_rank, score DESC
+-- LIMIT 1;
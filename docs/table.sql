@@ -19,14 +19,15 @@ CREATE TABLE hotspots (
 
     -- 向量嵌入（用于语义相似度识别）
     embedding vector,
+    embedding_h halfvec(1536),                        -- embedding 的半精度副本（由触发器同步，用于 HNSW 召回；HNSW 索引要求声明维度，需与向量模型维度一致）
     embedding_model VARCHAR(100) DEFAULT 'text-embedding-3-small',
 
     -- 聚类信息（用于识别语义相似热词）
     cluster_id BIGINT,
 
     -- 时间追踪
-    first_seen_at TIMESTAMP NOT NULL,                 -- 首次发现时间
-    last_seen_at TIMESTAMP NOT NULL,                  -- 最后出现时间
+    first_seen_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,  -- 首次发现时间
+    last_seen_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,   -- 最后出现时间
     appearance_count INT DEFAULT 1,                   -- 出现次数
 
     -- 平台信息
@@ -78,10 +79,16 @@ CREATE INDEX idx_hotspots_embedding ON hotspots
 USING hnsw (embedding vector_ip_ops)
 WITH (m = 16, ef_construction = 64);
 
+-- 半精度向量索引（相似度召回走该索引，内存带宽减半）
+CREATE INDEX idx_hotspots_embedding_h ON hotspots
+USING hnsw (embedding_h halfvec_ip_ops)
+WITH (m = 16, ef_construction = 64);
+
 COMMENT ON TABLE hotspots IS '热点主表-管理热词的完整生命周期';
 COMMENT ON COLUMN hotspots.keyword IS '原始热词名称';
 COMMENT ON COLUMN hotspots.normalized_keyword IS 'AI 归一化后的关键词（用于去重）';
 COMMENT ON COLUMN hotspots.embedding IS '文本向量嵌入（用于语义相似度识别）';
+COMMENT ON COLUMN hotspots.embedding_h IS 'embedding 的 halfvec 副本（用于 HNSW 候选召回）';
 COMMENT ON COLUMN hotspots.platforms IS '平台信息数组，包含平台名、排名、热度分数';
 
 -- 2. 热词聚类表（相似热词分组）
@@ -161,6 +168,9 @@ CREATE TABLE push_queue (
 
     -- 推送信息
     priority VARCHAR(20) DEFAULT 'medium' CHECK (priority IN ('high', 'medium', 'low')),
+    priority_rank SMALLINT GENERATED ALWAYS AS (
+        CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END
+    ) STORED,                                        -- 优先级排序值（可走索引，替代 CASE 排序）
     score DECIMAL(5, 2) NOT NULL,                    -- 冗余字段，方便排序
 
     -- 推送状态
@@ -188,10 +198,16 @@ CREATE TABLE push_queue (
     CONSTRAINT fk_push_queue_report FOREIGN KEY (report_id) REFERENCES business_reports (id) ON DELETE CASCADE
 );
 
-CREATE INDEX idx_push_queue_hotspot_id ON push_queue (hotspot_id);
+CREATE UNIQUE INDEX uk_push_queue_hotspot_id ON push_queue (hotspot_id);
 CREATE INDEX idx_push_queue_status ON push_queue (status);
 CREATE INDEX idx_push_queue_priority_score ON push_queue (priority, score DESC);
 CREATE INDEX idx_push_queue_scheduled_at ON push_queue (scheduled_at);
+CREATE INDEX idx_push_queue_pending_rank ON push_queue (priority_rank, score DESC)
+WHERE status = 'pending';
+CREATE INDEX idx_push_queue_pending_created_at ON push_queue (created_at DESC)
+INCLUDE (id, hotspot_id, status, updated_at)
+WHERE status = 'pending';
+CREATE INDEX idx_push_queue_status_sent_at ON push_queue (status, sent_at DESC);
 
 COMMENT ON TABLE push_queue IS '推送队列表-管理商业分析报告的推送调度';
 COMMENT ON COLUMN push_queue.scheduled_at IS '计划推送时间，用于控制推送间隔（每次间隔≥2小时）';
@@ -217,6 +233,18 @@ CREATE TRIGGER update_hotspot_clusters_updated_at BEFORE UPDATE ON hotspot_clust
 CREATE TRIGGER update_push_queue_updated_at BEFORE UPDATE ON push_queue
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- 同步 hotspots.embedding_h（embedding 的半精度副本）
+CREATE OR REPLACE FUNCTION sync_hotspot_embedding_h()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.embedding_h = NEW.embedding::halfvec(1536);
+    RETURN NEW;
+END;
+$$ LANGUAGE 'plpgsql';
+
+CREATE TRIGGER sync_hotspots_embedding_h BEFORE INSERT OR UPDATE OF embedding ON hotspots
+    FOR EACH ROW EXECUTE FUNCTION sync_hotspot_embedding_h();
+
 -- =====================================================
 -- 常用查询示例
 -- =====================================================
@@ -314,13 +342,7 @@ JOIN hotspots h ON pq.hotspot_id = h.id
 CROSS JOIN last_push lp
 WHERE pq.status = 'pending'
     AND (lp.last_sent_at IS NULL OR lp.last_sent_at < NOW() - INTERVAL '2 hours')
-ORDER BY
-    CASE pq.priority
-        WHEN 'high' THEN 1
-        WHEN 'medium' THEN 2
-        WHEN 'low' THEN 3
-    END,
-    pq.score DESC
+ORDER BY pq.priority_rank, pq.score DESC  -- 命中 idx_push_queue_pending_rank
 LIMIT 1;
 
 -- 9. 查看推送历史和效果
@@ -6,16 +6,40 @@ Proxy Agent Package
 __version__ = "1.0.0"
 __author__ = "Trend Collector"
 
-from .proxy_manager import ProxyManager
-from .websocket_client import WebSocketClient
-from .heartbeat import HeartbeatManager
-from .utils import get_public_ip, get_hostname, generate_agent_id
+import importlib
+
+# 延迟导入：首次访问属性时才加载对应子模块（PEP 562）
+_LAZY_IMPORTS = {
+    "ProxyManager": ".proxy_manager",
+    "WebSocketClient": ".websocket_client",
+    "HeartbeatManager": ".heartbeat",
+    "get_public_ip": ".utils",
+    "get_public_ip_async": ".utils",
+    "close_async_session": ".utils",
+    "get_hostname": ".utils",
+    "generate_agent_id": ".utils",
+}
 
 __all__ = [
     "ProxyManager",
     "WebSocketClient",
     "HeartbeatManager",
     "get_public_ip",
+    "get_public_ip_async",
+    "close_async_session",
     "get_hostname",
     "generate_agent_id",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,7 +6,7 @@ import asyncio
 import logging
 import time
 from typing import Optional
-from .utils import get_public_ip, get_location_info, get_hostname
+from .utils import get_public_ip_async, get_location_info_async, get_hostname
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +32,9 @@ class HeartbeatManager:
         self.interval = config["heartbeat"]["interval"]
         self.timeout = config["heartbeat"]["timeout"]
 
+        # Agent 名称运行期间不变，初始化时确定一次
+        self.agent_name = config["agent"].get("name") or get_hostname()
+
         # 缓存的信息
         self.public_ip: Optional[str] = None
         self.location_info: Optional[dict] = None
@@ -42,6 +45,14 @@ class HeartbeatManager:
         self.running = False
         self.task: Optional[asyncio.Task] = None
 
+        # IP 信息刷新任务（与心跳发送解耦）
+        self.ip_task: Optional[asyncio.Task] = None
+
+        # 心跳消息模板（静态字段只构建一次）
+        self._proxy_key: Optional[tuple] = None
+        self._message_template: dict = {}
+        self._proxy_template: dict = {}
+
     async def _update_ip_info(self):
         """更新 IP 和位置信息"""
         current_time = time.time()
@@ -54,14 +65,14 @@ class HeartbeatManager:
             logger.debug("Updating public IP information")
 
             # 获取公网 IP
-            new_ip = await asyncio.to_thread(get_public_ip)
+            new_ip = await get_public_ip_async()
 
             if new_ip and new_ip != self.public_ip:
                 logger.info(f"Public IP updated: {self.public_ip} -> {new_ip}")
                 self.public_ip = new_ip
 
                 # 获取位置信息
-                self.location_info = await asyncio.to_thread(get_location_info, new_ip)
+                self.location_info = await get_location_info_async(new_ip)
                 if self.location_info:
                     logger.info(f"Location: {self.location_info.get('city')}, {self.location_info.get('isp')}")
 
@@ -70,6 +81,39 @@ class HeartbeatManager:
         except Exception as e:
             logger.error(f"Failed to update IP info: {e}")
 
+    async def _ip_refresh_loop(self):
+        """
+        定期刷新 IP 和位置信息（独立于心跳循环，网络查询不阻塞心跳发送）
+        """
+        while self.running:
+            try:
+                await asyncio.sleep(self.ip_update_interval)
+                await self._update_ip_info()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in IP refresh loop: {e}")
+
+    def _rebuild_message_template(self, proxy_key: tuple):
+        """
+        构建心跳消息中不变部分的模板
+
+        Args:
+            proxy_key: (代理类型, 代理端口)
+        """
+        proxy_type, proxy_port = proxy_key
+        self._proxy_key = proxy_key
+        self._message_template = {
+            "action": "heartbeat",
+            "agent_id": self.agent_id,
+            "hostname": self.agent_name,
+        }
+        self._proxy_template = {"type": proxy_type, "port": proxy_port}
+
+        # 如果是 both 模式，添加 SOCKS5 端口
+        if proxy_type == "both":
+            self._proxy_template["socks5_port"] = proxy_port + 1
+
     def _build_heartbeat_message(self) -> dict:
         """
         构建心跳消息
@@ -77,60 +121,48 @@ class HeartbeatManager:
         Returns:
             dict: 心跳消息
         """
-        # 获取代理状态
-        proxy_status = self.proxy_manager.get_status()
+        # 代理端口可能被远程配置更新，变化时重建模板
+        proxy_key = (self.proxy_manager.proxy_type, self.proxy_manager.proxy_port)
+        if proxy_key != self._proxy_key:
+            self._rebuild_message_template(proxy_key)
 
-        # 获取 Agent 名称
-        agent_name = self.config["agent"].get("name") or get_hostname()
+        running = self.proxy_manager.is_running()
 
-        # 构建消息
-        message = {
-            "action": "heartbeat",
-            "agent_id": self.agent_id,
-            "hostname": agent_name,
-            "public_ip": self.public_ip,
-            "proxy": {
-                "type": self.proxy_manager.proxy_type,
-                "port": self.proxy_manager.proxy_port,
-                "running": proxy_status["running"],
-            },
-            "status": "online" if proxy_status["running"] else "offline",
-        }
+        # 在模板基础上只填充变化的字段
+        message = self._message_template.copy()
+        message["public_ip"] = self.public_ip
+        message["proxy"] = {**self._proxy_template, "running": running}
+        message["status"] = "online" if running else "offline"
 
         # 添加位置信息
         if self.location_info:
             message["city"] = self.location_info.get("city")
             message["isp"] = self.location_info.get("isp")
 
-        # 如果是 both 模式，添加 SOCKS5 端口
-        if self.proxy_manager.proxy_type == "both":
-            message["proxy"]["socks5_port"] = self.proxy_manager.proxy_port + 1
-
         return message
 
     async def send_heartbeat(self) -> bool:
         """
         发送心跳
 
+        心跳由 WebSocket 客户端在后台发送，实际发送失败由客户端记录日志
+
         Returns:
-            bool: 是否发送成功
+            bool: 心跳是否已提交发送（未连接时为 False）
         """
         try:
-            # 更新 IP 信息
-            await self._update_ip_info()
-
             # 构建心跳消息
             message = self._build_heartbeat_message()
 
-            # 发送消息
-            success = await self.websocket_client.send_message(message)
+            # 提交发送
+            queued = await self.websocket_client.send_message(message)
 
-            if success:
-                logger.debug("Heartbeat sent successfully")
+            if queued:
+                logger.debug("Heartbeat queued for sending")
             else:
-                logger.warning("Failed to send heartbeat")
+                logger.warning("Heartbeat not sent: not connected to master server")
 
-            return success
+            return queued
 
         except Exception as e:
             logger.error(f"Error sending heartbeat: {e}")
@@ -143,6 +175,10 @@ class HeartbeatManager:
         self.running = True
         logger.info(f"Heartbeat manager started (interval: {self.interval}s)")
 
+        # 首次心跳前获取 IP 信息，之后由独立任务定期刷新
+        await self._update_ip_info()
+        self.ip_task = asyncio.create_task(self._ip_refresh_loop())
+
         # 初始化时立即发送一次心跳
         await self.send_heartbeat()
 
@@ -163,8 +199,19 @@ class HeartbeatManager:
                 await asyncio.sleep(5)
 
         self.running = False
+        await self._cancel_ip_task()
         logger.info("Heartbeat manager stopped")
 
+    async def _cancel_ip_task(self):
+        """取消 IP 信息刷新任务"""
+        if self.ip_task and not self.ip_task.done():
+            self.ip_task.cancel()
+            try:
+                await self.ip_task
+            except asyncio.CancelledError:
+                pass
+        self.ip_task = None
+
     def start(self):
         """启动心跳管理器"""
         if self.task is None or self.task.done():
@@ -180,4 +227,5 @@ class HeartbeatManager:
                 await self.task
             except asyncio.CancelledError:
                 pass
+        await self._cancel_ip_task()
         logger.info("Heartbeat manager stopped")
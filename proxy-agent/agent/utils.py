@@ -2,16 +2,82 @@
 工具函数模块
 """
 
+import asyncio
+import json
 import socket
+import threading
+import time
 import uuid
 import platform
 import requests
+import aiohttp
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# 每个线程一个 HTTP 会话：复用连接（keep-alive），避免每次请求重新建立 TCP/TLS 连接。
+# requests.Session 不保证线程安全，而公网 IP 查询会在多个线程中并发执行
+_THREAD_LOCAL = threading.local()
 
+
+def _get_session() -> requests.Session:
+    """获取当前线程的 HTTP 会话（首次调用时创建）"""
+    session = getattr(_THREAD_LOCAL, "session", None)
+    if session is None:
+        session = _THREAD_LOCAL.session = requests.Session()
+    return session
+
+# 异步 HTTP 会话（需在事件循环内创建，首次使用时初始化）
+_ASYNC_SESSION: Optional[aiohttp.ClientSession] = None
+
+# 公网 IP 与地理位置缓存的有效期（秒）
+PUBLIC_IP_CACHE_TTL = 300
+LOCATION_CACHE_TTL = 900
+# 代理测试成功结果的有效期（秒），期间重复测试同一代理直接返回缓存
+PROXY_TEST_CACHE_TTL = 30
+# 异步 HTTP 会话的 DNS 解析缓存有效期（秒），aiohttp 默认只缓存 10 秒
+DNS_CACHE_TTL = 300
+
+# 缓存条目上限，超过时先清理过期条目，仍超出则淘汰最早写入的条目
+TTL_CACHE_MAX_SIZE = 1024
+
+# 带过期时间的进程内缓存: key -> (value, 过期时刻 monotonic)
+_TTL_CACHE: dict[Any, tuple[Any, float]] = {}
+
+# 缓存同时被事件循环线程和 _IP_EXECUTOR 工作线程访问，读写/淘汰都需持锁
+_TTL_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(key: Any) -> Optional[Any]:
+    """读取未过期的缓存值，不存在或已过期返回 None（过期条目读取时删除）"""
+    with _TTL_CACHE_LOCK:
+        entry = _TTL_CACHE.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() < entry[1]:
+            return entry[0]
+        _TTL_CACHE.pop(key, None)
+        return None
+
+
+def _cache_set(key: Any, value: Any, ttl: float):
+    """写入缓存，ttl 秒后过期"""
+    with _TTL_CACHE_LOCK:
+        now = time.monotonic()
+        _TTL_CACHE.pop(key, None)
+        if len(_TTL_CACHE) >= TTL_CACHE_MAX_SIZE:
+            for expired_key in [k for k, (_, expiry) in _TTL_CACHE.items() if expiry <= now]:
+                del _TTL_CACHE[expired_key]
+            # 仍然超出上限时按写入顺序淘汰最早的条目
+            while len(_TTL_CACHE) >= TTL_CACHE_MAX_SIZE:
+                del _TTL_CACHE[next(iter(_TTL_CACHE))]
+        _TTL_CACHE[key] = (value, now + ttl)
+
+
+@lru_cache(maxsize=1)
 def get_hostname() -> str:
     """
     获取主机名
@@ -36,43 +102,101 @@ def generate_agent_id() -> str:
     return str(uuid.uuid4())
 
 
+# IP 查询服务列表
+PUBLIC_IP_SERVICES = (
+    "https://api.ipify.org?format=json",
+    "https://ifconfig.me/ip",
+    "https://icanhazip.com",
+    "https://ipinfo.io/ip",
+)
+
+# 并发查询公网 IP 的线程池（各服务同时请求，取最先成功的结果）
+_IP_EXECUTOR = ThreadPoolExecutor(
+    max_workers=len(PUBLIC_IP_SERVICES), thread_name_prefix="public-ip"
+)
+
+
+def _parse_public_ip(service: str, text: str) -> Optional[str]:
+    """
+    解析 IP 查询服务的响应内容
+
+    Args:
+        service: IP 查询服务地址
+        text: 响应文本
+
+    Returns:
+        Optional[str]: 公网 IP 地址
+    """
+    # 处理不同的响应格式
+    text = text.strip()
+    if service.endswith("format=json"):
+        data = json.loads(text)
+        return data.get("ip")
+    return text or None
+
+
+def _fetch_public_ip(service: str) -> Optional[str]:
+    """
+    从单个服务查询公网 IP
+
+    Args:
+        service: IP 查询服务地址
+
+    Returns:
+        Optional[str]: 公网 IP 地址，失败返回 None
+    """
+    try:
+        response = _get_session().get(service, timeout=5)
+        if response.status_code == 200:
+            return _parse_public_ip(service, response.text)
+    except Exception as e:
+        logger.debug(f"Failed to get IP from {service}: {e}")
+    return None
+
+
 def get_public_ip() -> Optional[str]:
     """
     获取公网 IP 地址
 
-    尝试多个 IP 查询服务，返回第一个成功的结果
+    并发请求多个 IP 查询服务，返回最先成功的结果；
+    成功结果缓存 PUBLIC_IP_CACHE_TTL 秒
 
     Returns:
         Optional[str]: 公网 IP 地址，获取失败返回 None
     """
-    # IP 查询服务列表
-    services = [
-        "https://api.ipify.org?format=json",
-        "https://ifconfig.me/ip",
-        "https://icanhazip.com",
-        "https://ipinfo.io/ip",
-    ]
-
-    for service in services:
-        try:
-            response = requests.get(service, timeout=5)
-            if response.status_code == 200:
-                # 处理不同的响应格式
-                text = response.text.strip()
-                if service.endswith("format=json"):
-                    import json
-
-                    data = json.loads(text)
-                    return data.get("ip")
-                return text
-        except Exception as e:
-            logger.debug(f"Failed to get IP from {service}: {e}")
-            continue
+    cached = _cache_get("public_ip")
+    if cached is not None:
+        return cached
+
+    futures = [_IP_EXECUTOR.submit(_fetch_public_ip, service) for service in PUBLIC_IP_SERVICES]
+    try:
+        for future in as_completed(futures):
+            ip = future.result()
+            if ip:
+                _cache_set("public_ip", ip, PUBLIC_IP_CACHE_TTL)
+                return ip
+    finally:
+        # 已拿到结果时取消尚未开始的查询，正在进行的请求由超时自然结束
+        for future in futures:
+            future.cancel()
 
     logger.warning("Failed to get public IP from all services")
     return None
 
 
+@lru_cache(maxsize=1)
+def _get_system_info() -> dict:
+    """查询一次系统信息（运行期间不变）"""
+    return {
+        "platform": platform.system(),
+        "platform_release": platform.release(),
+        "platform_version": platform.version(),
+        "architecture": platform.machine(),
+        "processor": platform.processor(),
+        "hostname": get_hostname(),
+    }
+
+
 def get_system_info() -> dict:
     """
     获取系统信息
@@ -80,13 +204,27 @@ def get_system_info() -> dict:
     Returns:
         dict: 系统信息
     """
+    # 返回副本，避免调用方修改缓存
+    return dict(_get_system_info())
+
+
+def _parse_location(data: dict) -> Optional[dict]:
+    """
+    解析 ip-api.com 的响应
+
+    Args:
+        data: 响应 JSON
+
+    Returns:
+        Optional[dict]: 地理位置信息，查询失败返回 None
+    """
+    if data.get("status") != "success":
+        return None
     return {
-        "platform": platform.system(),
-        "platform_release": platform.release(),
-        "platform_version": platform.version(),
-        "architecture": platform.machine(),
-        "processor": platform.processor(),
-        "hostname": get_hostname(),
+        "city": data.get("city", "Unknown"),
+        "isp": data.get("isp", "Unknown"),
+        "country": data.get("country", "Unknown"),
+        "region": data.get("regionName", "Unknown"),
     }
 
 
@@ -94,6 +232,8 @@ def get_location_info(ip: str) -> Optional[dict]:
     """
     根据 IP 获取地理位置信息
 
+    成功结果按 IP 缓存 LOCATION_CACHE_TTL 秒
+
     Args:
         ip: IP 地址
 
@@ -103,18 +243,19 @@ def get_location_info(ip: str) -> Optional[dict]:
     if not ip:
         return None
 
+    cache_key = ("location", ip)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
     try:
         # 使用 ip-api.com 免费服务
-        response = requests.get(f"http://ip-api.com/json/{ip}?lang=zh-CN", timeout=5)
+        response = _get_session().get(f"http://ip-api.com/json/{ip}?lang=zh-CN", timeout=5)
         if response.status_code == 200:
-            data = response.json()
-            if data.get("status") == "success":
-                return {
-                    "city": data.get("city", "Unknown"),
-                    "isp": data.get("isp", "Unknown"),
-                    "country": data.get("country", "Unknown"),
-                    "region": data.get("regionName", "Unknown"),
-                }
+            location = _parse_location(response.json())
+            if location:
+                _cache_set(cache_key, location, LOCATION_CACHE_TTL)
+                return dict(location)
     except Exception as e:
         logger.debug(f"Failed to get location info for {ip}: {e}")
 
@@ -129,10 +270,13 @@ def test_proxy(
     password: str = None,
     test_url: str = "http://www.google.com",
     timeout: int = 10,
+    use_cache: bool = True,
 ) -> tuple[bool, Optional[float], Optional[str]]:
     """
     测试代理是否可用
 
+    成功结果缓存 PROXY_TEST_CACHE_TTL 秒，失败结果不缓存
+
     Args:
         proxy_host: 代理主机
         proxy_port: 代理端口
@@ -141,11 +285,16 @@ def test_proxy(
         password: 代理密码
         test_url: 测试 URL
         timeout: 超时时间
+        use_cache: 是否使用缓存的测试结果
 
     Returns:
         tuple: (是否可用, 响应时间(秒), 错误信息)
     """
-    import time
+    cache_key = ("proxy_test", proxy_host, proxy_port, proxy_type, username, test_url)
+    if use_cache:
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
 
     # 构建代理 URL
     if username and password:
@@ -160,12 +309,252 @@ def test_proxy(
 
     try:
         start_time = time.time()
-        response = requests.get(test_url, proxies=proxies, timeout=timeout)
+        response = _get_session().get(test_url, proxies=proxies, timeout=timeout)
         elapsed_time = time.time() - start_time
 
         if response.status_code == 200:
-            return True, elapsed_time, None
+            result = (True, elapsed_time, None)
+            _cache_set(cache_key, result, PROXY_TEST_CACHE_TTL)
+            return result
         else:
             return False, elapsed_time, f"HTTP {response.status_code}"
     except Exception as e:
         return False, None, str(e)
+
+
+def invalidate_proxy_test(proxy_host: str, proxy_port: int):
+    """
+    清除指定代理的测试结果缓存（调用方发现代理失效时调用）
+
+    Args:
+        proxy_host: 代理主机
+        proxy_port: 代理端口
+    """
+    with _TTL_CACHE_LOCK:
+        for key in [
+            key for key in _TTL_CACHE
+            if isinstance(key, tuple) and key[:3] == ("proxy_test", proxy_host, proxy_port)
+        ]:
+            del _TTL_CACHE[key]
+
+
+# ==================== 异步版本（供事件循环内调用，不阻塞其他协程） ====================
+
+
+def _get_async_session() -> aiohttp.ClientSession:
+    """获取共享的异步 HTTP 会话（不存在或已关闭时创建，复用连接并缓存 DNS 解析结果）"""
+    global _ASYNC_SESSION
+    if _ASYNC_SESSION is None or _ASYNC_SESSION.closed:
+        _ASYNC_SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(ttl_dns_cache=DNS_CACHE_TTL),
+            timeout=aiohttp.ClientTimeout(total=5),
+        )
+    return _ASYNC_SESSION
+
+
+async def close_async_session():
+    """关闭共享的异步 HTTP 会话（Agent 停止时调用）"""
+    global _ASYNC_SESSION
+    if _ASYNC_SESSION is not None and not _ASYNC_SESSION.closed:
+        await _ASYNC_SESSION.close()
+    _ASYNC_SESSION = None
+
+
+async def _fetch_public_ip_async(session: aiohttp.ClientSession, service: str) -> Optional[str]:
+    """从单个服务查询公网 IP（异步）"""
+    try:
+        async with session.get(service) as response:
+            if response.status == 200:
+                return _parse_public_ip(service, await response.text())
+    except Exception as e:
+        logger.debug(f"Failed to get IP from {service}: {e}")
+    return None
+
+
+async def get_public_ip_async() -> Optional[str]:
+    """
+    获取公网 IP 地址（异步）
+
+    并发请求多个 IP 查询服务，返回最先成功的结果并取消其余请求
+
+    Returns:
+        Optional[str]: 公网 IP 地址，获取失败返回 None
+    """
+    cached = _cache_get("public_ip")
+    if cached is not None:
+        return cached
+
+    session = _get_async_session()
+    pending = {
+        asyncio.create_task(_fetch_public_ip_async(session, service))
+        for service in PUBLIC_IP_SERVICES
+    }
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                ip = task.result()
+                if ip:
+                    _cache_set("public_ip", ip, PUBLIC_IP_CACHE_TTL)
+                    return ip
+    finally:
+        for task in pending:
+            task.cancel()
+
+    logger.warning("Failed to get public IP from all services")
+    return None
+
+
+# ip-api.com 批量查询：短时间窗口内的查询合并为一次 POST /batch（单次最多 100 个 IP）
+LOCATION_BATCH_URL = "http://ip-api.com/batch?lang=zh-CN"
+LOCATION_BATCH_MAX = 100
+LOCATION_BATCH_WINDOW = 0.1
+
+# 等待批量查询的 IP -> Future
+_location_pending: dict[str, asyncio.Future] = {}
+_location_flush_task: Optional[asyncio.Task] = None
+
+
+async def _flush_location_batch(delay: float):
+    """
+    等待合并窗口后，把待查询的 IP 通过一次批量请求发出，并回填各自的 Future
+
+    Args:
+        delay: 合并窗口（秒）
+    """
+    global _location_flush_task
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+    # 取出当前批次，之后到达的查询进入下一批
+    batch = dict(list(_location_pending.items())[:LOCATION_BATCH_MAX])
+    for ip in batch:
+        del _location_pending[ip]
+    _location_flush_task = None
+    if _location_pending:
+        _location_flush_task = asyncio.create_task(_flush_location_batch(LOCATION_BATCH_WINDOW))
+
+    results: dict[str, Optional[dict]] = {}
+    try:
+        session = _get_async_session()
+        async with session.post(LOCATION_BATCH_URL, json=list(batch)) as response:
+            if response.status == 200:
+                for data in await response.json(content_type=None):
+                    location = _parse_location(data)
+                    if location:
+                        results[data.get("query")] = location
+    except Exception as e:
+        logger.debug(f"Failed to get location info for {len(batch)} IP(s): {e}")
+
+    for ip, future in batch.items():
+        location = results.get(ip)
+        if location:
+            _cache_set(("location", ip), location, LOCATION_CACHE_TTL)
+        if not future.done():
+            future.set_result(location)
+
+
+async def get_location_info_async(ip: str) -> Optional[dict]:
+    """
+    根据 IP 获取地理位置信息（异步）
+
+    LOCATION_BATCH_WINDOW 秒内的查询会合并为一次 ip-api.com 批量请求
+
+    Args:
+        ip: IP 地址
+
+    Returns:
+        Optional[dict]: 地理位置信息 {"city": "城市", "isp": "运营商"}
+    """
+    global _location_flush_task
+    if not ip:
+        return None
+
+    cached = _cache_get(("location", ip))
+    if cached is not None:
+        return dict(cached)
+
+    future = _location_pending.get(ip)
+    if future is None:
+        future = asyncio.get_running_loop().create_future()
+        _location_pending[ip] = future
+
+        if _location_flush_task is None:
+            _location_flush_task = asyncio.create_task(_flush_location_batch(LOCATION_BATCH_WINDOW))
+        elif len(_location_pending) >= LOCATION_BATCH_MAX:
+            # 批次已满，立即发送，不再等待窗口结束
+            _location_flush_task.cancel()
+            _location_flush_task = asyncio.create_task(_flush_location_batch(0))
+
+    # shield：单个调用方被取消时不影响同批次的其他调用方
+    location = await asyncio.shield(future)
+    return dict(location) if location else None
+
+
+async def get_location_info_batch(ips: list[str]) -> dict[str, Optional[dict]]:
+    """
+    批量获取多个 IP 的地理位置信息（异步）
+
+    Args:
+        ips: IP 地址列表
+
+    Returns:
+        dict: IP -> 地理位置信息（查询失败为 None）
+    """
+    unique_ips = list(dict.fromkeys(ip for ip in ips if ip))
+    locations = await asyncio.gather(*(get_location_info_async(ip) for ip in unique_ips))
+    return dict(zip(unique_ips, locations))
+
+
+async def test_proxy_async(
+    proxy_host: str,
+    proxy_port: int,
+    proxy_type: str = "http",
+    username: str = None,
+    password: str = None,
+    test_url: str = "http://www.google.com",
+    timeout: int = 10,
+    use_cache: bool = True,
+) -> tuple[bool, Optional[float], Optional[str]]:
+    """
+    测试代理是否可用（异步）
+
+    aiohttp 只支持 HTTP 代理，其他代理类型在线程池中执行同步版本
+
+    Args:
+        参数同 test_proxy
+
+    Returns:
+        tuple: (是否可用, 响应时间(秒), 错误信息)
+    """
+    if proxy_type != "http":
+        return await asyncio.to_thread(
+            test_proxy, proxy_host, proxy_port, proxy_type,
+            username, password, test_url, timeout, use_cache,
+        )
+
+    cache_key = ("proxy_test", proxy_host, proxy_port, proxy_type, username, test_url)
+    if use_cache:
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+    proxy_auth = aiohttp.BasicAuth(username, password) if username and password else None
+
+    try:
+        start_time = time.time()
+        async with _get_async_session().get(
+            test_url,
+            proxy=f"http://{proxy_host}:{proxy_port}",
+            proxy_auth=proxy_auth,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            elapsed_time = time.time() - start_time
+
+            if response.status == 200:
+                result = (True, elapsed_time, None)
+                _cache_set(cache_key, result, PROXY_TEST_CACHE_TTL)
+                return result
+            return False, elapsed_time, f"HTTP {response.status}"
+    except Exception as e:
+        return False, None, str(e)
@@ -3,15 +3,45 @@ WebSocket 客户端
 负责与中控服务器建立 WebSocket 连接并处理通信
 """
 import asyncio
+import ipaddress
+import random
+import socket
+import time
 import websockets
-import json
+import orjson
 import logging
-from typing import Optional, Callable
+from typing import Optional, Callable, Union
+from urllib.parse import urlsplit
 from websockets.client import WebSocketClientProtocol
 
 logger = logging.getLogger(__name__)
 
 
+# 服务端要求稍后重连的关闭码：1012 Service Restart、1013 Try Again Later
+RETRY_LATER_CLOSE_CODES = (1012, 1013)
+RETRY_LATER_DELAY_MULTIPLIER = 4.0
+
+# 连接断开时保留、待新连接发送的消息数上限（超出时丢弃最早的消息）
+MAX_UNSENT_MESSAGES = 100
+
+# 未启用批处理时，后台并发发送的消息数上限；超过后 send_message 直接等待发送完成（背压）
+MAX_PENDING_SENDS = 100
+
+
+# 指令响应是固定结构，预先序列化好成功/失败两种结果，发送时直接复用
+_COMMAND_RESPONSES = {
+    command: {
+        success: orjson.Fragment(orjson.dumps({
+            "action": "command_response",
+            "command": command,
+            "success": success,
+        }))
+        for success in (True, False)
+    }
+    for command in ("enable_proxy", "disable_proxy", "restart_proxy", "update_config")
+}
+
+
 class WebSocketClient:
     """WebSocket 客户端"""
 
@@ -26,10 +56,36 @@ class WebSocketClient:
         self.config = config
         self.proxy_manager = proxy_manager
 
-        self.master_url = config["server"]["master_url"]
-        self.auth_token = config["server"]["auth_token"]
-        self.reconnect_interval = config["server"]["reconnect_interval"]
-        self.max_reconnect = config["server"]["max_reconnect"]
+        server_config = config["server"]
+        self.master_url = server_config["master_url"]
+        self.auth_token = server_config["auth_token"]
+        self.max_reconnect = server_config.get("max_reconnect", 0)
+
+        # 中控服务器地址的 DNS 解析缓存，避免每次重连都查询 DNS
+        self.dns_cache_ttl = float(server_config.get("dns_cache_ttl", 300))
+        self._resolved_address: Optional[tuple[str, float]] = None
+
+        # 重连退避：指数增长并封顶，叠加随机抖动，避免中控重启后所有 Agent 同时重连
+        # 兼容旧配置，未设置 reconnect_base 时沿用 reconnect_interval
+        self.reconnect_base = float(
+            server_config.get("reconnect_base", server_config.get("reconnect_interval", 1.0))
+        )
+        self.reconnect_max = float(server_config.get("reconnect_max", 60.0))
+        # 抖动比例：1.0 为完全抖动（在 [0, delay] 内随机），0 为不抖动
+        self.reconnect_jitter = min(max(float(server_config.get("reconnect_jitter", 1.0)), 0.0), 1.0)
+        # 服务端以 1012/1013 关闭连接（重启中/稍后重试）时，下一次重连等待时间的放大倍数
+        self._next_delay_multiplier = 1.0
+
+        # 发送批处理：短时间窗口内产生的消息合并为一个 batch 帧发送（需中控服务端支持 batch 动作）
+        self.batch_enabled = bool(server_config.get("batch_messages", True))
+        self.batch_window = float(server_config.get("batch_window_ms", 20)) / 1000
+        self.batch_max_size = max(int(server_config.get("batch_max_size", 50)), 1)
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._sender_task: Optional[asyncio.Task] = None
+        # 连接断开时未发出的消息（不含心跳），新连接发送第一帧后补发
+        self._unsent: list = []
+        # 未启用批处理时在后台执行的发送任务
+        self._pending_sends: set[asyncio.Task] = set()
 
         self.websocket: Optional[WebSocketClientProtocol] = None
         self.connected = False
@@ -38,6 +94,63 @@ class WebSocketClient:
         # 消息处理��调
         self.message_handlers = {}
 
+    def _next_reconnect_delay(self) -> float:
+        """
+        计算下一次重连前的等待时间（指数退避 + 随机抖动）
+
+        Returns:
+            float: 等待秒数
+        """
+        exponent = max(self.reconnect_count - 1, 0)
+        # 指数足够大时直接取上限，避免 2 ** n 过大
+        if exponent >= 32:
+            delay = self.reconnect_max
+        else:
+            delay = min(self.reconnect_max, self.reconnect_base * (2 ** exponent))
+
+        # 服务端正在重启时退避得更久（只作用于下一次重连）
+        if self._next_delay_multiplier != 1.0:
+            delay = min(self.reconnect_max, delay * self._next_delay_multiplier)
+            self._next_delay_multiplier = 1.0
+
+        jitter = delay * self.reconnect_jitter
+        return delay - jitter + random.uniform(0, jitter)
+
+    async def _resolve_master_host(self, host: str, port: int) -> Optional[str]:
+        """
+        解析中控服务器主机名（带 TTL 缓存）
+
+        Args:
+            host: 主机名
+            port: 端口
+
+        Returns:
+            Optional[str]: 解析得到的 IP，host 本身是 IP 或解析失败时返回 None
+        """
+        try:
+            ipaddress.ip_address(host)
+            return None
+        except ValueError:
+            pass
+
+        cached = self._resolved_address
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+        except OSError as e:
+            logger.warning(f"Failed to resolve {host}: {e}")
+            return None
+        if not infos:
+            return None
+
+        address = infos[0][4][0]
+        self._resolved_address = (address, time.monotonic() + self.dns_cache_ttl)
+        return address
+
     def register_handler(self, action: str, handler: Callable):
         """
         注册消息处理器
@@ -47,7 +160,7 @@ class WebSocketClient:
             handler: 处理函数
         """
         self.message_handlers[action] = handler
-        logger.debug(f"Registered handler for action: {action}")
+        logger.debug("Registered handler for action: %s", action)
 
     async def connect(self) -> bool:
         """
@@ -64,49 +177,202 @@ class WebSocketClient:
                 "Authorization": f"Bearer {self.auth_token}"
             }
 
+            # 使用缓存的解析结果建立连接；URL 中的主机名仍用于 Host 头和 TLS 校验
+            connect_kwargs = {}
+            url = urlsplit(self.master_url)
+            secure = url.scheme == "wss"
+            if url.hostname:
+                port = url.port or (443 if secure else 80)
+                address = await self._resolve_master_host(url.hostname, port)
+                if address:
+                    connect_kwargs["host"] = address
+                    connect_kwargs["port"] = port
+                    if secure:
+                        connect_kwargs["server_hostname"] = url.hostname
+
             self.websocket = await websockets.connect(
                 self.master_url,
                 extra_headers=headers,
                 ping_interval=20,
                 ping_timeout=10,
+                **connect_kwargs,
             )
 
+            # 握手成功不代表链路可用（服务端可能接受后立即关闭），
+            # 重连计数只在收到消息后重置（见 receive_messages）
             self.connected = True
-            self.reconnect_count = 0
             logger.info("Connected to master server successfully")
 
+            if self.batch_enabled:
+                await self._stop_sender()
+                self._start_sender()
+
             return True
 
         except Exception as e:
             logger.error(f"Failed to connect to master server: {e}")
             self.connected = False
+            # 连接失败可能是服务器地址已变更，下次重连重新解析
+            self._resolved_address = None
             return False
 
+    def _start_sender(self):
+        """为当前连接创建发送队列和后台发送任务"""
+        self._send_queue = asyncio.Queue()
+        self._sender_task = asyncio.create_task(self._sender_loop(self._send_queue))
+
+    async def _stop_sender(self):
+        """停止后台发送任务，队列中未发送的消息保留到下一个连接"""
+        task = self._sender_task
+        queue = self._send_queue
+        self._sender_task = None
+        self._send_queue = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        if queue is not None and not queue.empty():
+            remaining = []
+            while not queue.empty():
+                remaining.append(queue.get_nowait())
+            self._keep_unsent(remaining)
+
+    def _keep_unsent(self, messages: list):
+        """
+        保留未发送的消息，待下一个连接补发
+
+        心跳只反映发送时的状态，新连接会重新发送，因此直接丢弃；
+        其余消息（如指令响应）最多保留 MAX_UNSENT_MESSAGES 条
+
+        Args:
+            messages: 未发送的消息列表
+        """
+        kept = [
+            message for message in messages
+            if not (isinstance(message, dict) and message.get("action") == "heartbeat")
+        ]
+        dropped = len(messages) - len(kept)
+
+        self._unsent.extend(kept)
+        overflow = len(self._unsent) - MAX_UNSENT_MESSAGES
+        if overflow > 0:
+            del self._unsent[:overflow]
+            dropped += overflow
+
+        if kept or dropped:
+            logger.warning(
+                f"{len(messages)} message(s) not sent: {len(kept)} kept for next connection, "
+                f"{dropped} dropped"
+            )
+
+    async def _sender_loop(self, queue: asyncio.Queue):
+        """
+        后台发送循环
+
+        取到第一条消息后等待 batch_window 秒，把窗口内积累的消息合并为一帧发送；
+        只有一条消息时按原格式发送，不包装为 batch。
+        上一个连接遗留的消息在本连接的第一帧（握手心跳）发出后补发；
+        发送失败或被取消时，当前批次保留到下一个连接
+        """
+        while True:
+            batch = []
+            try:
+                batch.append(await queue.get())
+                await asyncio.sleep(self.batch_window)
+                while len(batch) < self.batch_max_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                if len(batch) == 1:
+                    payload = batch[0]
+                else:
+                    payload = {"action": "batch", "items": batch}
+
+                # 以文本帧发送（服务端使用 receive_text 接收）
+                await self.websocket.send(orjson.dumps(payload).decode())
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Sent %d message(s)", len(batch))
+            except asyncio.CancelledError:
+                self._keep_unsent(batch)
+                raise
+            except Exception as e:
+                logger.error(f"Failed to send message: {e}")
+                self._keep_unsent(batch)
+                self.connected = False
+                return
+
+            # 补发上一个连接未发出的消息
+            if self._unsent:
+                for message in self._unsent:
+                    queue.put_nowait(message)
+                self._unsent.clear()
+
+    async def _drain_pending_sends(self):
+        """等待后台发送任务完成（错误已在 _send_now 中处理）"""
+        if self._pending_sends:
+            await asyncio.gather(*self._pending_sends, return_exceptions=True)
+
     async def disconnect(self):
         """断开连接"""
+        await self._stop_sender()
+        await self._drain_pending_sends()
         if self.websocket:
             await self.websocket.close()
             self.websocket = None
         self.connected = False
         logger.info("Disconnected from master server")
 
-    async def send_message(self, message: dict) -> bool:
+    async def send_message(self, message: Union[dict, orjson.Fragment]) -> bool:
         """
         发送消息到中控服务器
 
+        启用批处理时消息进入发送队列，由后台任务合并发送；否则在后台任务中发送。
+        不等待消息写入 TCP 缓冲区，实际发送失败由后台任务记录日志并标记连接断开
+
         Args:
-            message: 消息字典
+            message: 消息字典，或已序列化的 orjson.Fragment
 
         Returns:
-            bool: 是否发送成功
+            bool: 消息是否已提交发送（未连接时为 False）
         """
         if not self.connected or not self.websocket:
             logger.error("Not connected to master server")
             return False
 
+        if self._send_queue is not None:
+            self._send_queue.put_nowait(message)
+            return True
+
+        # 后台发送过多时直接等待，避免无限堆积
+        if len(self._pending_sends) >= MAX_PENDING_SENDS:
+            return await self._send_now(message)
+
+        task = asyncio.create_task(self._send_now(message))
+        self._pending_sends.add(task)
+        task.add_done_callback(self._pending_sends.discard)
+        return True
+
+    async def _send_now(self, message: Union[dict, orjson.Fragment]) -> bool:
+        """
+        立即发送单条消息
+
+        Args:
+            message: 消息字典，或已序列化的 orjson.Fragment
+
+        Returns:
+            bool: 是否发送成功
+        """
+        websocket = self.websocket
+        if websocket is None:
+            return False
+
         try:
-            await self.websocket.send(json.dumps(message))
-            logger.debug(f"Sent message: {message.get('action', 'unknown')}")
+            # 以文本帧发送（服务端使用 receive_text 接收）
+            await websocket.send(orjson.dumps(message).decode())
+            if logger.isEnabledFor(logging.DEBUG) and isinstance(message, dict):
+                logger.debug("Sent message: %s", message.get("action", "unknown"))
             return True
         except Exception as e:
             logger.error(f"Failed to send message: {e}")
@@ -121,11 +387,15 @@ class WebSocketClient:
         """
         while self.connected:
             try:
-                message_str = await self.websocket.recv()
-                message = json.loads(message_str)
+                # 服务端以二进制帧下发 UTF-8 JSON，orjson 直接解析 bytes（也兼容文本帧）
+                message = orjson.loads(await self.websocket.recv())
+
+                # 收到有效消息说明链路正常，重置重连计数和退避时间
+                self.reconnect_count = 0
 
                 action = message.get("action")
-                logger.debug(f"Received message: {action}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Received message: %s", action)
 
                 # 调用对应的处理器
                 if action in self.message_handlers:
@@ -136,8 +406,13 @@ class WebSocketClient:
                 else:
                     logger.warning(f"No handler for action: {action}")
 
-            except websockets.exceptions.ConnectionClosed:
-                logger.warning("Connection closed by server")
+            except websockets.exceptions.ConnectionClosed as e:
+                code = e.rcvd.code if e.rcvd is not None else None
+                if code in RETRY_LATER_CLOSE_CODES:
+                    logger.warning(f"Connection closed by server (code {code}), backing off before reconnect")
+                    self._next_delay_multiplier = RETRY_LATER_DELAY_MULTIPLIER
+                else:
+                    logger.warning("Connection closed by server")
                 self.connected = False
                 break
             except Exception as e:
@@ -163,6 +438,7 @@ class WebSocketClient:
 
                     # 连接断开
                     self.connected = False
+                    await self._stop_sender()
 
                 # 检查是否需要重连
                 self.reconnect_count += 1
@@ -170,24 +446,34 @@ class WebSocketClient:
                     logger.error(f"Max reconnect attempts ({self.max_reconnect}) reached, giving up")
                     break
 
-                # 等待一段时间后重连
-                logger.info(f"Reconnecting in {self.reconnect_interval} seconds... (attempt {self.reconnect_count})")
-                await asyncio.sleep(self.reconnect_interval)
+                # 按指数退避等待后重连
+                delay = self._next_reconnect_delay()
+                logger.info(f"Reconnecting in {delay:.1f} seconds... (attempt {self.reconnect_count})")
+                await asyncio.sleep(delay)
             else:
                 # 保持连接
                 await asyncio.sleep(1)
 
+    async def _send_command_response(self, command: str, success: bool) -> bool:
+        """
+        发送预先序列化的指令响应
+
+        Args:
+            command: 指令名称
+            success: 是否执行成功
+
+        Returns:
+            bool: 响应是否已提交发送
+        """
+        return await self.send_message(_COMMAND_RESPONSES[command][bool(success)])
+
     async def handle_enable_proxy(self, message: dict):
         """处理启用代理指令"""
         logger.info("Received enable_proxy command")
         success = self.proxy_manager.start()
 
         # 发送响应
-        await self.send_message({
-            "action": "command_response",
-            "command": "enable_proxy",
-            "success": success,
-        })
+        await self._send_command_response("enable_proxy", success)
 
     async def handle_disable_proxy(self, message: dict):
         """处理禁用代理指令"""
@@ -195,11 +481,7 @@ class WebSocketClient:
         success = self.proxy_manager.stop()
 
         # 发送响应
-        await self.send_message({
-            "action": "command_response",
-            "command": "disable_proxy",
-            "success": success,
-        })
+        await self._send_command_response("disable_proxy", success)
 
     async def handle_restart_proxy(self, message: dict):
         """处理重启代理指令"""
@@ -207,11 +489,7 @@ class WebSocketClient:
         success = self.proxy_manager.restart()
 
         # 发送响应
-        await self.send_message({
-            "action": "command_response",
-            "command": "restart_proxy",
-            "success": success,
-        })
+        await self._send_command_response("restart_proxy", success)
 
     async def handle_update_config(self, message: dict):
         """处理更新配置指令"""
@@ -226,11 +504,7 @@ class WebSocketClient:
         success = self.proxy_manager.restart()
 
         # 发送响应
-        await self.send_message({
-            "action": "command_response",
-            "command": "update_config",
-            "success": success,
-        })
+        await self._send_command_response("update_config", success)
 
     def register_default_handlers(self):
         """注册默认的消息处理器"""
@@ -90,25 +90,39 @@ async def example_3_multiple_requests():
         "https://httpbin.org/headers",
     ]
 
-    for i, url in enumerate(urls, 1):
-        print(f"\n请求 {i}: {url}")
-
-        # 获取代理
-        try:
-            proxy_info: IpInfoModel = await proxy_pool.get_proxy()
-            proxy_url = proxy_info.format_httpx_proxy()
-
-            print(f"  使用代理: {proxy_info.ip}:{proxy_info.port}")
+    # 每个代理复用一个客户端（连接池 + keep-alive），避免每次请求重新握手
+    clients: dict[str, httpx.AsyncClient] = {}
+    # 限制并发数，不超过代理池大小
+    semaphore = asyncio.Semaphore(5)
+
+    async def fetch(i: int, url: str):
+        async with semaphore:
+            # 获取代理
+            try:
+                proxy_info: IpInfoModel = await proxy_pool.get_proxy()
+                proxy_url = proxy_info.format_httpx_proxy()
 
-            # 发起请求
-            async with httpx.AsyncClient(proxy=proxy_url, timeout=10.0) as client:
+                # 发起请求
+                client = clients.get(proxy_url)
+                if client is None:
+                    client = clients[proxy_url] = httpx.AsyncClient(proxy=proxy_url, timeout=10.0)
                 response = await client.get(url)
+                print(f"\n请求 {i}: {url}")
+                print(f"  使用代理: {proxy_info.ip}:{proxy_info.port}")
                 print(f"  响应状态: {response.status_code}")
 
-        except Exception as e:
-            print(f"  请求失败: {e}")
-            # 如果需要，标记代理无效
-            # await proxy_pool.mark_ip_invalid(proxy_info)
+            except Exception as e:
+                print(f"\n请求 {i}: {url}")
+                print(f"  请求失败: {e}")
+                # 如果需要，标记代理无效
+                # await proxy_pool.mark_ip_invalid(proxy_info)
+
+    # 并发发起所有请求
+    try:
+        await asyncio.gather(*(fetch(i, url) for i, url in enumerate(urls, 1)))
+    finally:
+        for client in clients.values():
+            await client.aclose()
 
 
 async def example_4_retry_with_different_proxy():
@@ -208,8 +222,25 @@ async def example_6_integration_with_crawler():
 
     # 模拟爬虫场景
     class SimpleCrawler:
-        def __init__(self):
+        def __init__(self, concurrency: int = 5):
             self.proxy_pool = None
+            # 限制同时进行的请求数，不超过代理池大小
+            self.semaphore = asyncio.Semaphore(concurrency)
+            # 按代理 URL 缓存客户端，同一代理的请求复用连接
+            self.clients: dict[str, httpx.AsyncClient] = {}
+
+        def get_client(self, proxy_url: str) -> httpx.AsyncClient:
+            """获取（或创建）代理对应的 HTTP 客户端"""
+            client = self.clients.get(proxy_url)
+            if client is None:
+                client = self.clients[proxy_url] = httpx.AsyncClient(proxy=proxy_url, timeout=10.0)
+            return client
+
+        async def close(self):
+            """关闭所有 HTTP 客户端"""
+            for client in self.clients.values():
+                await client.aclose()
+            self.clients.clear()
 
         async def init_proxy_pool(self):
             """初始化代理池"""
@@ -233,11 +264,10 @@ async def example_6_integration_with_crawler():
                     print(f"  [尝试 {attempt}] 使用代理 {proxy_info.ip}:{proxy_info.port}")
 
                     # 发起请求
-                    async with httpx.AsyncClient(proxy=proxy_url, timeout=10.0) as client:
-                        response = await client.get(url)
+                    response = await self.get_client(proxy_url).get(url)
 
-                        if response.status_code == 200:
-                            return response.text
+                    if response.status_code == 200:
+                        return response.text
 
                 except Exception as e:
                     print(f"  [尝试 {attempt}] 失败: {e}")
@@ -246,16 +276,22 @@ async def example_6_integration_with_crawler():
 
             raise Exception(f"获取页面失败，已尝试 {max_retries} 次")
 
-        async def crawl(self, urls: list):
-            """爬取多个 URL"""
-            for i, url in enumerate(urls, 1):
-                print(f"\n爬取 {i}/{len(urls)}: {url}")
+        async def crawl_one(self, i: int, total: int, url: str):
+            """爬取单个 URL"""
+            async with self.semaphore:
+                print(f"\n爬取 {i}/{total}: {url}")
                 try:
                     content = await self.fetch_page(url)
                     print(f"  ✓ 成功，内容长度: {len(content)} 字节")
                 except Exception as e:
                     print(f"  ✗ 失败: {e}")
 
+        async def crawl(self, urls: list):
+            """并发爬取多个 URL"""
+            await asyncio.gather(
+                *(self.crawl_one(i, len(urls), url) for i, url in enumerate(urls, 1))
+            )
+
     # 使用爬虫
     crawler = SimpleCrawler()
     await crawler.init_proxy_pool()
@@ -265,7 +301,10 @@ async def example_6_integration_with_crawler():
         "https://httpbin.org/json",
     ]
 
-    await crawler.crawl(urls)
+    try:
+        await crawler.crawl(urls)
+    finally:
+        await crawler.close()
 
 
 async def main():
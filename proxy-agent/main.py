@@ -5,6 +5,8 @@ Proxy Agent 主程序
 """
 
 import asyncio
+import copy
+import os
 import sys
 import signal
 import logging
@@ -12,18 +14,35 @@ import yaml
 from pathlib import Path
 from logging.handlers import RotatingFileHandler
 
+try:
+    # 可选依赖：uvloop（基于 libuv 的事件循环，网络 I/O 更快），未安装时使用默认事件循环
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from agent import (
     ProxyManager,
     WebSocketClient,
     HeartbeatManager,
+    close_async_session,
     generate_agent_id,
     get_hostname,
 )
 
 
+# 已解析的配置文件缓存：绝对路径 -> 配置字典
+_CONFIG_CACHE: dict[str, dict] = {}
+
+# Agent ID 文件（相对于启动目录）
+AGENT_ID_FILE = ".agent_id"
+
+
 class ProxyAgent:
     """代理 Agent 主类"""
 
+    # 已读取或生成的 Agent ID：ID 文件绝对路径 -> Agent ID
+    _agent_ids: dict[str, str] = {}
+
     def __init__(self, config_file: str = "config.yaml"):
         """
         初始化 Agent
@@ -64,15 +83,21 @@ class ProxyAgent:
         Returns:
             dict: 配置字典
         """
-        config_path = Path(config_file)
-        if not config_path.exists():
-            print(f"Error: Config file not found: {config_file}")
-            sys.exit(1)
+        config_path = Path(config_file).resolve()
+        cache_key = str(config_path)
+
+        config = _CONFIG_CACHE.get(cache_key)
+        if config is None:
+            if not config_path.exists():
+                print(f"Error: Config file not found: {config_file}")
+                sys.exit(1)
 
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f)
+            _CONFIG_CACHE[cache_key] = config
 
-        return config
+        # 返回副本，避免实例修改影响缓存
+        return copy.deepcopy(config)
 
     def _setup_logging(self):
         """设置日志"""
@@ -115,22 +140,33 @@ class ProxyAgent:
         Returns:
             str: Agent ID
         """
-        agent_id_file = Path(".agent_id")
+        agent_id_file = Path(AGENT_ID_FILE).resolve()
+        cache_key = str(agent_id_file)
+
+        agent_id = self._agent_ids.get(cache_key)
+        if agent_id:
+            return agent_id
 
-        # 如果文件存在，读取 ID
-        if agent_id_file.exists():
-            with open(agent_id_file, "r", encoding="utf-8") as f:
-                agent_id = f.read().strip()
-                if agent_id:
-                    return agent_id
+        # 如果文件存在，读取 ID（文件很小，直接用 os.read 一次读完）
+        try:
+            fd = os.open(agent_id_file, os.O_RDONLY)
+        except FileNotFoundError:
+            agent_id = ""
+        else:
+            try:
+                agent_id = os.read(fd, 256).decode("utf-8").strip()
+            finally:
+                os.close(fd)
 
-        # 否则生成新的 ID
-        agent_id = generate_agent_id()
+        if not agent_id:
+            # 否则生成新的 ID
+            agent_id = generate_agent_id()
 
-        # 保存到文件
-        with open(agent_id_file, "w", encoding="utf-8") as f:
-            f.write(agent_id)
+            # 保存到文件
+            with open(agent_id_file, "w", encoding="utf-8") as f:
+                f.write(agent_id)
 
+        self._agent_ids[cache_key] = agent_id
         return agent_id
 
     async def start(self):
@@ -146,34 +182,64 @@ class ProxyAgent:
 
         self.running = True
 
-        # 启动代理服务
-        logging.info("Starting proxy service...")
-        if self.proxy_manager.start():
-            logging.info("Proxy service started successfully")
-        else:
-            logging.error("Failed to start proxy service")
-            return
+        try:
+            # 启动代理服务
+            logging.info("Starting proxy service...")
+            if self.proxy_manager.start():
+                logging.info("Proxy service started successfully")
+            else:
+                logging.error("Failed to start proxy service")
+                return
+
+            # 创建任务
+            tasks = [
+                asyncio.create_task(self.websocket_client.run(), name="websocket"),
+                asyncio.create_task(self.heartbeat_manager.run(), name="heartbeat"),
+            ]
+            self._install_signal_handlers(tasks)
+
+            logging.info("Agent started successfully")
+
+            # 等待任务完成（或被信号取消）
+            try:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            except asyncio.CancelledError:
+                logging.info("Agent tasks cancelled")
+        finally:
+            # 在同一个事件循环中统一清理
+            await self.stop()
 
-        # 创建任务
-        tasks = [
-            asyncio.create_task(self.websocket_client.run(), name="websocket"),
-            asyncio.create_task(self.heartbeat_manager.run(), name="heartbeat"),
-        ]
+    def _install_signal_handlers(self, tasks: list):
+        """
+        在当前事件循环上注册 SIGINT/SIGTERM 处理器
 
-        logging.info("Agent started successfully")
+        收到信号时取消主任务，由 start() 的 finally 统一执行 stop()
 
-        # 等待任务完成（或被取消）
-        try:
-            await asyncio.gather(*tasks, return_exceptions=True)
-        except asyncio.CancelledError:
-            logging.info("Agent tasks cancelled")
+        Args:
+            tasks: 需要取消的主任务列表
+        """
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._handle_signal, sig, tasks)
+            except (NotImplementedError, RuntimeError):
+                # Windows 不支持 add_signal_handler，依赖 KeyboardInterrupt 退出
+                pass
+
+    def _handle_signal(self, sig: signal.Signals, tasks: list):
+        """信号回调：取消主任务"""
+        logging.info(f"Received signal {sig.name}, shutting down...")
+        for task in tasks:
+            task.cancel()
 
     async def stop(self):
-        """停止 Agent"""
-        logging.info("Stopping Proxy Agent...")
-
+        """停止 Agent（只执行一次）"""
+        if not self.running:
+            return
         self.running = False
 
+        logging.info("Stopping Proxy Agent...")
+
         # 停止心跳管理器
         await self.heartbeat_manager.stop()
 
@@ -183,37 +249,21 @@ class ProxyAgent:
         # 停止代理服务
         self.proxy_manager.stop()
 
+        # 关闭共享的异步 HTTP 会话
+        await close_async_session()
+
         logging.info("Proxy Agent stopped")
 
     def run(self):
         """运行 Agent（阻塞）"""
-
-        # 设置信号处理
-        def signal_handler(sig, frame):
-            logging.info(f"Received signal {sig}, shutting down...")
-            # 创建一个新的事件循环来运行停止协程
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.stop())
-            loop.close()
-            sys.exit(0)
-
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
-
-        # 运行主循环
+        # 信号处理和资源清理都在 start() 的事件循环内完成
+        loop_factory = uvloop.new_event_loop if uvloop is not None else None
         try:
-            asyncio.run(self.start())
+            asyncio.run(self.start(), loop_factory=loop_factory)
         except KeyboardInterrupt:
             logging.info("Received KeyboardInterrupt")
         except Exception as e:
             logging.error(f"Error in main loop: {e}", exc_info=True)
-        finally:
-            # 确保清理资源
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.stop())
-            loop.close()
 
 
 def main():
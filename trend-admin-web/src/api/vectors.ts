@@ -6,6 +6,7 @@ import type {
   VectorSearchResponse,
   VectorDeleteResponse,
   ListCollectionsResponse,
+  ListVectorsResponse,
   VectorInfo,
 } from '@/types/api';
 
@@ -30,7 +31,14 @@ export const vectorsApi = {
   get: (vectorId: number) =>
     apiClient.get<any, { success: boolean; data: VectorInfo }>(`/api/v1/vectors/get/${vectorId}`),
 
-  // 列出所有集合
+  // 列出所有集合（仅数量）
   listCollections: () =>
     apiClient.get<any, ListCollectionsResponse>('/api/v1/vectors/collections'),
+
+  // 分页列出集合中的向量
+  listVectors: (collectionId: string, params?: { page?: number; page_size?: number }) =>
+    apiClient.get<any, ListVectorsResponse>(
+      `/api/v1/vectors/collection/${encodeURIComponent(collectionId)}/vectors`,
+      { params }
+    ),
 };
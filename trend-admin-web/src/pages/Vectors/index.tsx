@@ -16,6 +16,7 @@ import {
   Slider,
   Divider,
   Select,
+  Pagination,
 } from 'antd';
 import {
   PlusOutlined,
@@ -48,6 +49,8 @@ function Vectors() {
   );
   const [searchResults, setSearchResults] = useState<VectorSearchResult[]>([]);
   const [selectedCollection, setSelectedCollection] = useState<string | null>(null);
+  const [vectorPage, setVectorPage] = useState(1);
+  const vectorPageSize = 24;
 
   // 获取集合列表
   const {
@@ -61,6 +64,22 @@ function Vectors() {
 
   const collections = collectionsData?.collections || [];
 
+  // 分页获取当前选中集合的向量
+  const { data: vectorsData, refetch: refetchVectors } = useQuery({
+    queryKey: ['vector-collection-vectors', selectedCollection, vectorPage],
+    queryFn: () =>
+      vectorsApi.listVectors(selectedCollection as string, {
+        page: vectorPage,
+        page_size: vectorPageSize,
+      }),
+    enabled: !!selectedCollection,
+  });
+
+  const selectCollection = (collectionId: string | null) => {
+    setSelectedCollection(collectionId);
+    setVectorPage(1);
+  };
+
   // 添加向量
   const addMutation = useMutation({
     mutationFn: vectorsApi.add,
@@ -69,6 +88,7 @@ function Vectors() {
       addForm.resetFields();
       setAddModalVisible(false);
       refetchCollections();
+      refetchVectors();
     },
     onError: (error: any) => {
       message.error(`添加失败: ${error.message}`);
@@ -81,6 +101,7 @@ function Vectors() {
     onSuccess: (data) => {
       message.success(data.message);
       refetchCollections();
+      refetchVectors();
     },
     onError: (error: any) => {
       message.error(`删除失败: ${error.message}`);
@@ -93,7 +114,7 @@ function Vectors() {
     onSuccess: (data) => {
       message.success(data.message);
       if (selectedCollection === data.message.split("'")[1]) {
-        setSelectedCollection(null);
+        selectCollection(null);
       }
       refetchCollections();
     },
@@ -162,9 +183,7 @@ function Vectors() {
   };
 
   // 获取当前选中集合的向量列表
-  const currentVectors =
-    collections.find((c: CollectionInfo) => c.collection_id === selectedCollection)?.vectors ||
-    [];
+  const currentVectors = (selectedCollection && vectorsData?.vectors) || [];
 
   return (
     <div className="vectors-container">
@@ -259,7 +278,7 @@ function Vectors() {
                   className={`collection-item ${
                     selectedCollection === collection.collection_id ? 'active' : ''
                   }`}
-                  onClick={() => setSelectedCollection(collection.collection_id)}
+                  onClick={() => selectCollection(collection.collection_id)}
                 >
                   <div className="collection-info">
                     <FolderOutlined className="collection-icon" />
@@ -365,6 +384,16 @@ function Vectors() {
                   </Text>
                 </Card>
               ))}
+              {(vectorsData?.total || 0) > vectorPageSize && (
+                <Pagination
+                  current={vectorPage}
+                  pageSize={vectorPageSize}
+                  total={vectorsData?.total || 0}
+                  onChange={setVectorPage}
+                  showSizeChanger={false}
+                  style={{ gridColumn: '1 / -1', textAlign: 'center' }}
+                />
+              )}
             </div>
           )}
         </div>
@@ -284,7 +284,8 @@ export interface VectorInfo {
 export interface CollectionInfo {
   collection_id: string;
   count: number;
-  vectors: VectorInfo[];
+  latest?: string;
+  vectors?: VectorInfo[];
 }
 
 export interface ListCollectionsResponse {
@@ -292,6 +293,14 @@ export interface ListCollectionsResponse {
   collections: CollectionInfo[];
 }
 
+export interface ListVectorsResponse {
+  success: boolean;
+  total: number;
+  page: number;
+  page_size: number;
+  vectors: VectorInfo[];
+}
+
 // ==================== 热点管理相关类型 ====================
 
 // 热点状态枚举